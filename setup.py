@@ -12,7 +12,9 @@ setup(
     extras_require={
         "web": [
             "fastapi>=0.111.0",
+            "pydantic>=2.0",
             "uvicorn[standard]>=0.30.0",
+            "orjson>=3.9.0",
         ]
     },
     entry_points={
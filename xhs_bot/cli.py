@@ -10,6 +10,7 @@ from datetime import datetime
 import math
 import os
 import re
+import weakref
 
 from urllib.parse import quote_plus
 
@@ -294,6 +295,24 @@ DEFAULT_PREVIEW_NOTE_MIN_S = 1.4
 DEFAULT_PREVIEW_NOTE_MAX_S = 4.0
 
 
+# True once the card's like icon points at the "liked" sprite
+_JS_IS_LIKED_FN = (
+    "(note) => { const u = note.querySelector('svg.like-icon use'); "
+    "return !!u && (u.getAttribute('xlink:href') || u.getAttribute('href') || '').toLowerCase().includes('liked'); }"
+)
+
+# Scroll down by y, then optionally scroll back up by rebound after delay seconds
+# without blocking the bot on the second step.
+_SCROLL_WITH_REBOUND_JS = """
+([y, rebound, delay]) => {
+  window.scrollBy(0, y);
+  if (rebound > 0) {
+    setTimeout(() => window.scrollBy(0, -rebound), delay * 1000);
+  }
+}
+"""
+
+
 def now_ts() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -378,6 +397,25 @@ async def send_notification(text: str) -> tuple[bool, str]:
     return await asyncio.to_thread(_run)
 
 
+_LATEST_FILTER_ACTIVE_JS = """
+() => {
+  const top = document.querySelector('.search-layout__top');
+  if (!top) return false;
+  const actives = Array.from(top.querySelectorAll('.tags.active span'));
+  return actives.some(el => (el.textContent || '').includes('最新'));
+}
+"""
+
+
+async def wait_for_manual_filter(page: Page, timeout_ms: int = 60000) -> bool:
+    """Wait until the 最新 filter is active (e.g. toggled by hand), up to the timeout."""
+    try:
+        await page.wait_for_function(_LATEST_FILTER_ACTIVE_JS, timeout=timeout_ms, polling=500)
+        return True
+    except Exception:
+        return False
+
+
 async def apply_latest_filter(page: Page, config: "BotConfig") -> bool:
     """Hover filter control and click the 最新 tag if it becomes available."""
     if config.verbose:
@@ -514,17 +552,7 @@ async def apply_latest_filter(page: Page, config: "BotConfig") -> bool:
             activated = True
         except Exception:
             try:
-                await page.wait_for_function(
-                    """
-                    () => {
-                      const top = document.querySelector('.search-layout__top');
-                      if (!top) return false;
-                      const actives = Array.from(top.querySelectorAll('.tags.active span'));
-                      return actives.some(el => (el.textContent || '').includes('最新'));
-                    }
-                    """,
-                    timeout=2000,
-                )
+                await page.wait_for_function(_LATEST_FILTER_ACTIVE_JS, timeout=2000)
                 activated = True
             except Exception:
                 activated = False
@@ -587,6 +615,8 @@ class BotConfig:
     comment_texts: Optional[List[str]] = None
     comment_submit: bool = False  # default dry-run: type only, do not submit
     comment_after_like_only: bool = True
+    comment_parallelism: int = 1  # >1: comment on separate pages in the background
+    comment_fast_insert: bool = True  # insert text in one call; False types per character
     comment_buckets: Dict[str, List[str]] = field(default_factory=dict)
     dwell_prob: float = DEFAULT_DWELL_PROB
     dwell_min_s: float = DEFAULT_DWELL_MIN_S
@@ -622,6 +652,10 @@ async def create_context(config: BotConfig) -> tuple[Playwright, BrowserContext]
             await browser.add_init_script(STEALTH_INIT_SCRIPT)
         except Exception:
             pass
+    try:
+        await browser.add_init_script(_PAGE_HELPERS_INIT_SCRIPT)
+    except Exception:
+        pass
     try:
         if config.accept_language:
             for page in browser.pages:
@@ -651,6 +685,15 @@ def compute_jittered_delay_seconds(base_delay_ms: int, jitter_pct: int) -> float
     return total_ms / 1000.0
 
 
+def compute_backoff_seconds(
+    attempt: int, base_s: float = 1.0, cap_s: float = 30.0, jitter: float = 0.5
+) -> float:
+    """Exponential backoff (base * 2**attempt) with +/- jitter fraction, capped at cap_s."""
+    jitter = max(0.0, min(jitter, 0.95))
+    raw = base_s * (2 ** max(0, attempt)) * (1.0 + random.uniform(-jitter, jitter))
+    return max(0.0, min(cap_s, raw))
+
+
 async def maybe_hover_element(page: Page, element_handle, hover_probability: float) -> None:
     try:
         if random.random() <= max(0.0, min(1.0, hover_probability)):
@@ -754,10 +797,16 @@ async def maybe_revisit_feed(page: Page, config: BotConfig) -> None:
         pass
 
 
+# Card anchors that open the note, most specific first
+_COVER_SELECTORS = ('a.cover.mask.ld', 'a.cover.mask', 'a.cover', 'a[href^="/explore/"]')
+# Present while a note is open, either as the feed overlay or as a full page
+_NOTE_OVERLAY_SELECTOR = '.interactions.engage-bar, .note-container, #noteContainer'
+
+
 async def preview_note_detail(page: Page, note_handle, config: BotConfig) -> bool:
     try:
         cover = None
-        for sel in ['a.cover.mask.ld', 'a.cover.mask', 'a.cover', 'a[href^="/explore/"]']:
+        for sel in _COVER_SELECTORS:
             try:
                 el = await note_handle.query_selector(sel)
             except Exception:
@@ -775,9 +824,7 @@ async def preview_note_detail(page: Page, note_handle, config: BotConfig) -> boo
         await cover.click()
         opened = False
         try:
-            await page.wait_for_selector(
-                '.interactions.engage-bar, .note-container, #noteContainer', timeout=2500
-            )
+            await page.wait_for_selector(_NOTE_OVERLAY_SELECTOR, timeout=2500)
             opened = True
         except Exception:
             pass
@@ -813,18 +860,20 @@ async def maybe_preview_note_detail(page: Page, note_handle, info: Dict[str, Any
         return False
 
 
-def choose_comment_text(info: Dict[str, Any], config: BotConfig) -> Optional[str]:
-    buckets = getattr(config, "comment_buckets", {}) or {}
-    pool: List[str] = []
+def _comment_bucket_key(info: Dict[str, Any]) -> str:
     like_count = info.get("likeCount")
-    bucket_key = "general"
     if isinstance(like_count, (int, float)):
         if like_count < 20:
-            bucket_key = "low"
-        elif like_count < 120:
-            bucket_key = "mid"
-        else:
-            bucket_key = "high"
+            return "low"
+        if like_count < 120:
+            return "mid"
+        return "high"
+    return "general"
+
+
+def _comment_pool(config: BotConfig, bucket_key: str) -> List[str]:
+    buckets = getattr(config, "comment_buckets", {}) or {}
+    pool: List[str] = []
     specific = buckets.get(bucket_key)
     if specific:
         pool.extend(specific)
@@ -834,10 +883,35 @@ def choose_comment_text(info: Dict[str, Any], config: BotConfig) -> Optional[str
     if not pool:
         fallback = config.comment_texts or []
         pool.extend(fallback)
-    pool = [text for text in pool if text]
-    if not pool:
-        return None
-    return random.choice(pool)
+    return [text for text in pool if text]
+
+
+class CommentPicker:
+    """Per-session comment chooser that deals from a reshuffled deck per like-count bucket.
+
+    Every text in a bucket's pool is used once before any repeats.
+    """
+
+    def __init__(self, config: BotConfig) -> None:
+        self._config = config
+        self._decks: Dict[str, List[str]] = {}
+
+    def pick(self, info: Dict[str, Any]) -> Optional[str]:
+        bucket_key = _comment_bucket_key(info)
+        deck = self._decks.get(bucket_key)
+        if not deck:
+            deck = _comment_pool(self._config, bucket_key)
+            if not deck:
+                return None
+            random.shuffle(deck)
+            self._decks[bucket_key] = deck
+        return deck.pop()
+
+
+def _note_id(url: str) -> str:
+    """Return the trailing note id of an /explore/ URL, without query string or fragment."""
+    path = url.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+    return path.rsplit("/", 1)[-1]
 
 
 async def _ensure_note_handle(page: Page, note, info: Dict[str, Any]):
@@ -851,7 +925,7 @@ async def _ensure_note_handle(page: Page, note, info: Dict[str, Any]):
     target_url = info.get("exploreHref") or ""
     if not target_url:
         return None
-    note_id = target_url.rstrip("/").split("/")[-1]
+    note_id = _note_id(target_url)
     if not note_id:
         return None
 
@@ -877,21 +951,23 @@ async def _is_handle_connected(handle) -> bool:
         return False
 
 
+_LIKE_TARGET_SELECTORS = (
+    "span.like-wrapper button",
+    "span.like-wrapper",
+    "button:has-text(\"点赞\")",
+    "button:has-text(\"Like\")",
+    "button:has-text(\"喜欢\")",
+    "[aria-label*='like' i]",
+    "[aria-label*='喜欢' i]",
+    "[data-role*='like' i]",
+    "svg.like-icon",
+    ".like-wrapper .like-icon",
+    "button.like-btn",
+)
+
+
 async def _resolve_like_target(note_handle) -> Optional[Any]:
-    selectors = [
-        "span.like-wrapper button",
-        "span.like-wrapper",
-        "button:has-text(\"点赞\")",
-        "button:has-text(\"Like\")",
-        "button:has-text(\"喜欢\")",
-        "[aria-label*='like' i]",
-        "[aria-label*='喜欢' i]",
-        "[data-role*='like' i]",
-        "svg.like-icon",
-        ".like-wrapper .like-icon",
-        "button.like-btn",
-    ]
-    for sel in selectors:
+    for sel in _LIKE_TARGET_SELECTORS:
         candidate = None
         try:
             candidate = await note_handle.query_selector(sel)
@@ -1001,12 +1077,17 @@ async def like_latest_from_search(
     comments_typed = 0
     comment_attempts = 0
     last_comment_time = 0.0
+    comment_parallelism = max(1, getattr(config, "comment_parallelism", 1))
+    comment_semaphore = asyncio.Semaphore(comment_parallelism)
+    comment_tasks: List[asyncio.Task] = []
+    comment_page_pool = PagePool(context, max_idle=comment_parallelism)
+    comment_picker = CommentPicker(config)
     dom_detached_recent = []
     empty_candidate_rounds = 0
     max_reload_attempts = 3
     reload_attempts = 0
 
-    async def record_resilience_event(event_type: str, reason: str) -> None:
+    def record_resilience_event(event_type: str, reason: str) -> None:
         entry = {
             "ts": now_ts(),
             "event": event_type,
@@ -1030,13 +1111,13 @@ async def like_latest_from_search(
                     pass
                 return True
             except Exception as exc:
-                await record_resilience_event(
+                record_resilience_event(
                     "nav-retry",
                     f"{label}:{exc.__class__.__name__}:attempt={attempt}",
                 )
                 if attempt >= attempts:
                     raise
-                await asyncio.sleep(random.uniform(2.0, 4.0) * attempt)
+                await asyncio.sleep(compute_backoff_seconds(attempt))
         return False
 
     await navigate_with_retries("initial-load", search_url, attempts=3)
@@ -1046,8 +1127,11 @@ async def like_latest_from_search(
         await asyncio.sleep(random.uniform(2.5, 4.5))
     else:
         if config.verbose:
-            print("Waiting 60 seconds so you can switch filters before automation starts...")
-        await asyncio.sleep(60)
+            print("Waiting up to 60 seconds so you can switch filters before automation starts...")
+        if await wait_for_manual_filter(page, timeout_ms=60000):
+            if config.verbose:
+                print("最新 filter detected; starting automation.")
+            await asyncio.sleep(random.uniform(1.0, 2.0))
 
     start_ts = time.monotonic()
     session_start_monotonic = start_ts
@@ -1072,14 +1156,17 @@ async def like_latest_from_search(
             return False
         reload_attempts += 1
         try:
-            await record_resilience_event("reload", reason)
+            record_resilience_event("reload", reason)
             await navigate_with_retries(f"reload:{reason}", search_url, attempts=2)
-            await asyncio.sleep(random.uniform(4.0, 6.0))
+            # 4-6s after the first reload, growing if the feed keeps drying up
+            await asyncio.sleep(
+                compute_backoff_seconds(reload_attempts, base_s=2.5, cap_s=20.0, jitter=0.2)
+            )
             filter_refreshed = await apply_latest_filter(page, config)
             if filter_refreshed:
                 await asyncio.sleep(random.uniform(2.0, 3.5))
             else:
-                await record_resilience_event("filter-manual", f"reload:{reason}")
+                record_resilience_event("filter-manual", f"reload:{reason}")
             seen_explore_ids.clear()
             empty_candidate_rounds = 0
             dom_detached_recent = []
@@ -1183,6 +1270,59 @@ async def like_latest_from_search(
         )
         return cast(Dict[str, Any], data)  # type: ignore
 
+    def report_comment_result(note_url: str, comment_text: str, ok: bool, reason: str) -> None:
+        if not config.verbose:
+            return
+        if ok:
+            preview = comment_text if len(comment_text) <= 160 else (comment_text[:160] + "...")
+            label = "Submitted" if config.comment_submit else "Typed (dry-run)"
+            print(f"[{now_ts()}] {label} comment on {note_url}: {preview}")
+        else:
+            print(f"[{now_ts()}] Comment skipped on {note_url}: {reason}")
+
+    async def run_background_comment(note_url: str, comment_text: str) -> None:
+        nonlocal comments_typed
+        try:
+            async with comment_semaphore:
+                ok, reason = await try_type_comment_on_note(
+                    context, note_url, comment_text, config, comment_page_pool
+                )
+        except Exception as exc:
+            ok, reason = False, f"error:{exc.__class__.__name__}"
+        if ok:
+            comments_typed += 1
+        report_comment_result(note_url, comment_text, ok, reason)
+
+    async def collect_candidates() -> List[tuple[Any, Dict[str, Any]]]:
+        # Only a few more likes may be needed; stop scanning once there is
+        # enough headroom (3x the remaining target) to absorb skips.
+        remaining = max(0, session_like_target - len(liked_items))
+        max_candidates = max(4, remaining * 3)
+        collected: List[tuple[Any, Dict[str, Any]]] = []
+        note_handles = await page.query_selector_all("section.note-item")
+        for note in note_handles:
+            try:
+                info = await extract_note_info(note)
+            except Exception:
+                continue
+            url = info.get("exploreHref") or ""
+            if not url:
+                continue
+            note_id = _note_id(url)
+            if note_id in seen_explore_ids:
+                continue
+            if info.get("alreadyLiked"):
+                continue
+            # Claim the note up front so the action loop needs no second dedupe gate.
+            seen_explore_ids.add(note_id)
+            collected.append((note, info))
+            if len(collected) >= max_candidates:
+                break
+        return collected
+
+    # Next round's candidates, collected while the end-of-round pause is running
+    next_candidates_task: Optional[asyncio.Task] = None
+
     idle_rounds = 0
     max_rounds = 120
     last_liked_count = 0
@@ -1201,306 +1341,302 @@ async def like_latest_from_search(
         spacing_sec = max(1.0, duration_sec / float(session_like_target))
     schedule_jitter_frac = 0.2
 
-    while len(liked_items) < session_like_target and idle_rounds < 8 and max_rounds > 0:
-        max_rounds -= 1
-        block_state = await _detect_block_state(page)
-        if block_state == "login-required":
-            session_state.update(
-                {
-                    "block_state": "login-required",
-                    "message": "Session appears logged out; reauthenticate.",
-                }
-            )
-            if config.verbose:
-                print("Detected logged-out session. Please sign in again.")
-            if not session_expired_logged:
-                skipped_items.append(
+    # Background comment tasks and the prefetch share this page and context, so they
+    # must be settled on every exit path (Stop, cancellation, errors) before the caller closes them.
+    try:
+        while len(liked_items) < session_like_target and idle_rounds < 8 and max_rounds > 0:
+            max_rounds -= 1
+            block_state = await _detect_block_state(page)
+            if block_state == "login-required":
+                session_state.update(
                     {
-                        "url": "",
-                        "title": "",
-                        "reason": "session-expired",
+                        "block_state": "login-required",
+                        "message": "Session appears logged out; reauthenticate.",
                     }
                 )
-                session_expired_logged = True
-            break
-        if block_state == "rate-limit":
-            session_state.update(
-                {
-                    "block_state": "rate-limit",
-                    "message": "Rate limit or verification detected.",
-                }
-            )
-            if config.verbose:
-                print("Detected potential rate limit or verification. Backing off.")
-            await asyncio.sleep(random.uniform(30.0, 90.0))
-            break
-        note_handles = await page.query_selector_all("section.note-item")
-        candidates: List[tuple[Any, Dict[str, Any]]] = []
-        for note in note_handles:
-            try:
-                info = await extract_note_info(note)
-            except Exception:
-                continue
-            url = info.get("exploreHref") or ""
-            if not url:
-                continue
-            if url in seen_explore_ids:
-                continue
-            if info.get("alreadyLiked"):
+                if config.verbose:
+                    print("Detected logged-out session. Please sign in again.")
+                if not session_expired_logged:
+                    skipped_items.append(
+                        {
+                            "url": "",
+                            "title": "",
+                            "reason": "session-expired",
+                        }
+                    )
+                    session_expired_logged = True
+                break
+            if block_state == "rate-limit":
+                session_state.update(
+                    {
+                        "block_state": "rate-limit",
+                        "message": "Rate limit or verification detected.",
+                    }
+                )
+                if config.verbose:
+                    print("Detected potential rate limit or verification. Backing off.")
+                await asyncio.sleep(random.uniform(30.0, 90.0))
+                break
+            candidates: Optional[List[tuple[Any, Dict[str, Any]]]] = None
+            if next_candidates_task is not None:
+                prefetched, next_candidates_task = next_candidates_task, None
+                try:
+                    candidates = await prefetched
+                except Exception:
+                    candidates = None
+            if candidates is None:
+                candidates = await collect_candidates()
+
+            low_like: List[tuple[Any, Dict[str, Any]]] = []
+            others: List[tuple[Any, Dict[str, Any]]] = []
+            for item in candidates:
+                lc = item[1].get("likeCount")
+                if isinstance(lc, (int, float)) and lc < 10:
+                    low_like.append(item)
+                else:
+                    others.append(item)
+            if config.random_order:
+                random.shuffle(low_like)
+                random.shuffle(others)
+            ordered = low_like + others
+
+            if not ordered:
+                empty_candidate_rounds += 1
+                if empty_candidate_rounds >= 3:
+                    if await reload_feed("no-candidates"):
+                        continue
+                await asyncio.sleep(random.uniform(1.0, 2.0))
                 continue
-            candidates.append((note, info))
-
-        low_like = [
-            (n, i)
-            for (n, i) in candidates
-            if isinstance(i.get("likeCount"), (int, float))
-            and i.get("likeCount") is not None
-            and i.get("likeCount") < 10
-        ]
-        others = [(n, i) for (n, i) in candidates if (n, i) not in low_like]
-        if config.random_order:
-            random.shuffle(low_like)
-            random.shuffle(others)
-        ordered = low_like + others
-
-        if not ordered:
-            empty_candidate_rounds += 1
-            if empty_candidate_rounds >= 3:
-                if await reload_feed("no-candidates"):
+            else:
+                empty_candidate_rounds = 0
+
+            progress = False
+            for note, info in ordered:
+                if duration_sec and spacing_sec:
+                    target_time = start_ts + len(liked_items) * spacing_sec
+                    target_time += random.uniform(-schedule_jitter_frac, schedule_jitter_frac) * spacing_sec
+                    now = time.monotonic()
+                    if now < target_time:
+                        await asyncio.sleep(target_time - now)
+                    if now > start_ts + duration_sec:
+                        break
+                url = info.get("exploreHref") or ""
+                if random.random() > max(0.0, min(1.0, config.like_prob)):
+                    await maybe_preview_note_detail(page, note, info, config)
+                    await maybe_take_feed_break(page, config)
                     continue
-            await asyncio.sleep(random.uniform(1.0, 2.0))
-            continue
-        else:
-            empty_candidate_rounds = 0
-
-        progress = False
-        for note, info in ordered:
-            if duration_sec and spacing_sec:
-                target_time = start_ts + len(liked_items) * spacing_sec
-                target_time += random.uniform(-schedule_jitter_frac, schedule_jitter_frac) * spacing_sec
-                now = time.monotonic()
-                if now < target_time:
-                    await asyncio.sleep(target_time - now)
-                if now > start_ts + duration_sec:
-                    break
-            url = info.get("exploreHref") or ""
-            if not url or url in seen_explore_ids:
-                continue
-            seen_explore_ids.add(url)
-            if random.random() > max(0.0, min(1.0, config.like_prob)):
-                await maybe_preview_note_detail(page, note, info, config)
-                await maybe_take_feed_break(page, config)
-                continue
-            try:
-                note = await _ensure_note_handle(page, note, info) or note
-                attempts = 0
-                max_attempts = 3
-                last_exc: Optional[Exception] = None
-                dom_detached_failure = False
-
-                while attempts < max_attempts:
-                    like_target = await _resolve_like_target(note)
-                    if like_target is None:
-                        note = await _ensure_note_handle(page, note, info) or note
-                        attempts += 1
-                        await asyncio.sleep(0.1)
-                        continue
-
-                    if config.verbose:
-                        lc_repr = info.get("likeCount")
-                        print(f"Liking: {url} (likes={lc_repr})")
-
-                    try:
-                        await note.scroll_into_view_if_needed()
-                    except Exception:
-                        pass
-
-                    await maybe_idle_like_human(page, config)
-                    await maybe_hover_element(page, like_target, config.hover_prob)
+                try:
+                    note = await _ensure_note_handle(page, note, info) or note
+                    attempts = 0
+                    max_attempts = 3
+                    last_exc: Optional[Exception] = None
+                    dom_detached_failure = False
+
+                    while attempts < max_attempts:
+                        like_target = await _resolve_like_target(note)
+                        if like_target is None:
+                            note = await _ensure_note_handle(page, note, info) or note
+                            attempts += 1
+                            await asyncio.sleep(0.1)
+                            continue
 
-                    if not await _is_handle_connected(like_target):
-                        dom_detached_failure = True
-                        attempts += 1
-                        if attempts >= max_attempts:
-                            break
-                        note = await _ensure_note_handle(page, note, info) or note
-                        await asyncio.sleep(random.uniform(0.1, 0.3))
-                        continue
+                        if config.verbose:
+                            lc_repr = info.get("likeCount")
+                            print(f"Liking: {url} (likes={lc_repr})")
 
-                    try:
                         try:
-                            await like_target.wait_for_element_state("stable")
+                            await note.scroll_into_view_if_needed()
                         except Exception:
                             pass
-                        await like_target.click()
-                    except Exception as exc:
-                        last_exc = exc
-                        msg = str(exc).lower()
-                        if "not attached" in msg:
-                            dom_detached_failure = True
-                            attempts += 1
-                            if attempts >= max_attempts:
-                                break
-                            note = await _ensure_note_handle(page, note, info) or note
-                            await asyncio.sleep(random.uniform(0.1, 0.3))
-                            continue
-                        raise
 
-                    try:
-                        await page.wait_for_function(
-                            "(note) => { const u = note.querySelector('svg.like-icon use'); return u && (u.getAttribute('xlink:href')||u.getAttribute('href')||'').includes('liked'); }",
-                            arg=note,
-                            timeout=2000,
-                        )
-                    except Exception:
-                        pass
+                        await maybe_idle_like_human(page, config)
+                        await maybe_hover_element(page, like_target, config.hover_prob)
 
-                    try:
-                        state_changed = await page.evaluate(
-                            "(note) => { const u = note.querySelector('svg.like-icon use'); const href = u ? (u.getAttribute('xlink:href')||u.getAttribute('href')||'') : ''; return href.toLowerCase().includes('liked'); }",
-                            note,
-                        )
-                    except Exception:
+                        # A detached target surfaces as a "not attached" click error below.
+                        try:
+                            # click() performs its own visible/stable/enabled checks
+                            await like_target.click(timeout=5000)
+                        except Exception as exc:
+                            last_exc = exc
+                            msg = str(exc).lower()
+                            if "not attached" in msg:
+                                dom_detached_failure = True
+                                attempts += 1
+                                if attempts >= max_attempts:
+                                    break
+                                note = await _ensure_note_handle(page, note, info) or note
+                                await asyncio.sleep(random.uniform(0.1, 0.3))
+                                continue
+                            raise
+
+                        # A resolved wait already proves the liked state; only re-read it on timeout.
                         state_changed = False
+                        try:
+                            await page.wait_for_function(_JS_IS_LIKED_FN, arg=note, timeout=2000)
+                            state_changed = True
+                        except Exception:
+                            try:
+                                state_changed = await page.evaluate(_JS_IS_LIKED_FN, note)
+                            except Exception:
+                                state_changed = False
+
+                        if state_changed:
+                            liked_items.append(
+                                {
+                                    "url": url,
+                                    "title": info.get("title", ""),
+                                }
+                            )
+                            progress = True
+                            if config.verbose:
+                                print(f"[{now_ts()}] Liked: {url}")
+                            # Maybe type a comment after like (dry-run by default)
+                            comment_was_attempted = False
+                            comments_pending = sum(1 for t in comment_tasks if not t.done())
+                            if (
+                                config.comment_texts
+                                and len(config.comment_texts) > 0
+                                and comments_typed + comments_pending < max(0, config.comment_max_per_session)
+                            ):
+                                should_comment = random.random() <= max(0.0, min(1.0, config.comment_prob))
+                                now_t = time.monotonic()
+                                interval_ok = (now_t - last_comment_time) >= max(0.0, config.comment_min_interval_s)
+                                if should_comment and interval_ok:
+                                    comment_was_attempted = True
+                                    comment_text = comment_picker.pick(info)
+                                    if not comment_text:
+                                        comment_was_attempted = False
+                                    else:
+                                        comment_attempts += 1
+                                        if config.verbose:
+                                            preview = comment_text if len(comment_text) <= 160 else (comment_text[:160] + "...")
+                                            action = "submit" if config.comment_submit else "type (dry-run)"
+                                            print(f"[{now_ts()}] Preparing to {action} comment on {url}: {preview}")
+                                        if comment_parallelism > 1:
+                                            # The comment runs on its own page, opened by URL rather than via the
+                                            # card. The interval slot is reserved at queue time, whether or not
+                                            # the comment later succeeds.
+                                            last_comment_time = time.monotonic()
+                                            comment_tasks.append(
+                                                asyncio.create_task(run_background_comment(url, comment_text))
+                                            )
+                                        else:
+                                            # Prefer opening via card cover click to preserve SPA context and tokens
+                                            ok, reason = await try_open_and_type_comment_from_card(
+                                                context, page, note, url, comment_text, config, comment_page_pool
+                                            )
+                                            if ok:
+                                                comments_typed += 1
+                                                last_comment_time = time.monotonic()
+                                            report_comment_result(url, comment_text, ok, reason)
+                            if not comment_was_attempted:
+                                await maybe_preview_note_detail(page, note, info, config)
+                            await maybe_take_feed_break(page, config)
+                            await sleep_after_like()
+                            break
 
-                    if state_changed:
-                        liked_items.append(
+                        if config.verbose:
+                            print(f"Skipped (already-liked or unchanged): {url}")
+                        skipped_items.append(
                             {
                                 "url": url,
                                 "title": info.get("title", ""),
+                                "reason": "unchanged",
                             }
                         )
-                        progress = True
-                        if config.verbose:
-                            print(f"[{now_ts()}] Liked: {url}")
-                        # Maybe type a comment after like (dry-run by default)
-                        comment_was_attempted = False
-                        if (
-                            config.comment_texts
-                            and len(config.comment_texts) > 0
-                            and comments_typed < max(0, config.comment_max_per_session)
-                        ):
-                            should_comment = random.random() <= max(0.0, min(1.0, config.comment_prob))
-                            now_t = time.monotonic()
-                            interval_ok = (now_t - last_comment_time) >= max(0.0, config.comment_min_interval_s)
-                            if should_comment and interval_ok:
-                                comment_was_attempted = True
-                                comment_text = choose_comment_text(info, config)
-                                if not comment_text:
-                                    comment_was_attempted = False
-                                else:
-                                    comment_attempts += 1
-                                    if config.verbose:
-                                        preview = comment_text if len(comment_text) <= 160 else (comment_text[:160] + "...")
-                                        action = "submit" if config.comment_submit else "type (dry-run)"
-                                        print(f"[{now_ts()}] Preparing to {action} comment on {url}: {preview}")
-                                    # Prefer opening via card cover click to preserve SPA context and tokens
-                                    ok, reason = await try_open_and_type_comment_from_card(
-                                        context, page, note, url, comment_text, config
-                                    )
-                                    if ok:
-                                        comments_typed += 1
-                                        last_comment_time = time.monotonic()
-                                        if config.verbose:
-                                            preview2 = comment_text if len(comment_text) <= 160 else (comment_text[:160] + "...")
-                                            label = "Submitted" if config.comment_submit else "Typed (dry-run)"
-                                            print(f"[{now_ts()}] {label} comment on {url}: {preview2}")
-                                    else:
-                                        if config.verbose:
-                                            print(f"[{now_ts()}] Comment skipped on {url}: {reason}")
-                        if not comment_was_attempted:
-                            await maybe_preview_note_detail(page, note, info, config)
                         await maybe_take_feed_break(page, config)
-                        await sleep_after_like()
-                        break
+                        await maybe_preview_note_detail(page, note, info, config)
 
-                    if config.verbose:
-                        print(f"Skipped (already-liked or unchanged): {url}")
-                    skipped_items.append(
-                        {
-                            "url": url,
-                            "title": info.get("title", ""),
-                            "reason": "unchanged",
-                        }
-                    )
-                    await maybe_take_feed_break(page, config)
-                    await maybe_preview_note_detail(page, note, info, config)
+                        if attempts == 0:
+                            note = await _ensure_note_handle(page, note, info) or note
+                            attempts += 1
+                            await asyncio.sleep(0.1)
+                            continue
 
-                    if attempts == 0:
-                        note = await _ensure_note_handle(page, note, info) or note
-                        attempts += 1
-                        await asyncio.sleep(0.1)
-                        continue
+                        break
 
-                    break
+                    if attempts >= max_attempts and (not liked_items or liked_items[-1]["url"] != url):
+                        reason = "dom-detached" if dom_detached_failure else "unresolved"
+                        skipped_items.append(
+                            {
+                                "url": url,
+                                "title": info.get("title", ""),
+                                "reason": reason,
+                            }
+                        )
+                        if reason == "dom-detached":
+                            dom_detached_recent.append(time.monotonic())
+                            dom_detached_recent = [t for t in dom_detached_recent if time.monotonic() - t <= 180.0]
+                            if len(dom_detached_recent) >= 8:
+                                if await reload_feed("dom-detached-spike"):
+                                    break
+
+                    if len(liked_items) >= session_like_target:
+                        break
 
-                if attempts >= max_attempts and (not liked_items or liked_items[-1]["url"] != url):
-                    reason = "dom-detached" if dom_detached_failure else "unresolved"
+                except Exception as exc:
+                    err_msg = str(exc)
+                    if config.verbose:
+                        print(
+                            f"Error while liking {url}: {exc.__class__.__name__}: {err_msg}"
+                        )
+                    skip_reason = "dom-detached" if "not attached" in err_msg.lower() else "error"
                     skipped_items.append(
                         {
                             "url": url,
                             "title": info.get("title", ""),
-                            "reason": reason,
+                            "reason": skip_reason,
+                            "error_type": exc.__class__.__name__,
+                            "error_message": err_msg[:200],
                         }
                     )
-                    if reason == "dom-detached":
+                    if skip_reason == "dom-detached":
                         dom_detached_recent.append(time.monotonic())
                         dom_detached_recent = [t for t in dom_detached_recent if time.monotonic() - t <= 180.0]
                         if len(dom_detached_recent) >= 8:
                             if await reload_feed("dom-detached-spike"):
-                                break
-
-                if len(liked_items) >= session_like_target:
-                    break
-
-            except Exception as exc:
-                err_msg = str(exc)
-                if config.verbose:
-                    print(
-                        f"Error while liking {url}: {exc.__class__.__name__}: {err_msg}"
-                    )
-                skip_reason = "dom-detached" if "not attached" in err_msg.lower() else "error"
-                skipped_items.append(
-                    {
-                        "url": url,
-                        "title": info.get("title", ""),
-                        "reason": skip_reason,
-                        "error_type": exc.__class__.__name__,
-                        "error_message": err_msg[:200],
-                    }
-                )
-                if skip_reason == "dom-detached":
-                    dom_detached_recent.append(time.monotonic())
-                    dom_detached_recent = [t for t in dom_detached_recent if time.monotonic() - t <= 180.0]
-                    if len(dom_detached_recent) >= 8:
-                        if await reload_feed("dom-detached-spike"):
-                            continue
-                await maybe_take_feed_break(page, config)
-                continue
-        if len(liked_items) == last_liked_count and not progress:
-            idle_rounds += 1
-        else:
-            idle_rounds = 0
-        last_liked_count = len(liked_items)
-        if len(liked_items) >= session_like_target:
-            break
-        try:
-            scroll_y = random.randint(int(0.6 * 800), int(1.3 * 800))
-            if random.random() < 0.6:
-                await page.mouse.wheel(0, scroll_y)
+                                continue
+                    await maybe_take_feed_break(page, config)
+                    continue
+            if len(liked_items) == last_liked_count and not progress:
+                idle_rounds += 1
             else:
-                await page.evaluate("(y) => window.scrollBy(0, y)", scroll_y)
-                if random.random() < 0.25:
-                    await asyncio.sleep(random.uniform(0.2, 0.6))
-                    await page.mouse.wheel(0, -random.randint(50, 200))
-        except Exception:
-            pass
-        await maybe_revisit_feed(page, config)
-        if random.random() <= config.long_pause_prob:
-            await asyncio.sleep(random.uniform(config.long_pause_min_s, config.long_pause_max_s))
-        else:
+                idle_rounds = 0
+            last_liked_count = len(liked_items)
+            if len(liked_items) >= session_like_target:
+                break
+            try:
+                scroll_y = random.randint(int(0.6 * 800), int(1.3 * 800))
+                # Occasional small reverse scroll (same ~10% rate as before), scheduled page-side
+                rebound_y, rebound_delay = 0, 0.0
+                if random.random() < 0.1:
+                    rebound_y = random.randint(50, 200)
+                    rebound_delay = random.uniform(0.2, 0.6)
+                await page.evaluate(_SCROLL_WITH_REBOUND_JS, [scroll_y, rebound_y, rebound_delay])
+            except Exception:
+                pass
+            await maybe_revisit_feed(page, config)
+            # Let scroll-loaded cards render before the next round is collected
             await asyncio.sleep(random.uniform(0.4, 1.1))
-        await maybe_take_feed_break(page, config)
+            next_candidates_task = asyncio.create_task(collect_candidates())
+            if random.random() <= config.long_pause_prob:
+                await asyncio.sleep(random.uniform(config.long_pause_min_s, config.long_pause_max_s))
+            await maybe_take_feed_break(page, config)
+    except BaseException:
+        # Stopped or failed: don't keep typing comments into a context that is about to close
+        for task in comment_tasks:
+            if not task.done():
+                task.cancel()
+        raise
+    finally:
+        pending = list(comment_tasks)
+        if next_candidates_task is not None:
+            if not next_candidates_task.done():
+                next_candidates_task.cancel()
+            pending.append(next_candidates_task)
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        await comment_page_pool.close()
     # record comment metrics
     try:
         session_state.setdefault("comments", {})
@@ -1515,6 +1651,25 @@ async def like_latest_from_search(
     return liked_items[:session_like_target], skipped_items, session_state
 
 
+_COMMENT_INPUT_SELECTORS = (
+    '#content-textarea.content-input[contenteditable="true"]',
+    'p#content-textarea[contenteditable="true"]',
+    '.input-box .content-edit #content-textarea',
+    '.content-edit [contenteditable="true"]',
+)
+# Last comment-input selector that matched on each page; tried first next time.
+# Weak keys so a closed page's entry goes away with it.
+_COMMENT_INPUT_WINNER: "weakref.WeakKeyDictionary[Page, str]" = weakref.WeakKeyDictionary()
+
+
+def _comment_input_selectors(page: Page) -> Tuple[str, ...]:
+    # Last winner for this page first, then the rest in priority order
+    winner = _COMMENT_INPUT_WINNER.get(page)
+    if winner:
+        return (winner,) + tuple(sel for sel in _COMMENT_INPUT_SELECTORS if sel != winner)
+    return _COMMENT_INPUT_SELECTORS
+
+
 async def _find_comment_input(page: Page):
     # Scope strictly within the engage bar to avoid typing into global search bars
     try:
@@ -1523,24 +1678,60 @@ async def _find_comment_input(page: Page):
         engage = None
     if not engage:
         return None
-    selectors = [
-        '#content-textarea.content-input[contenteditable="true"]',
-        'p#content-textarea[contenteditable="true"]',
-        '.input-box .content-edit #content-textarea',
-        '.content-edit [contenteditable="true"]',
-    ]
-    for sel in selectors:
+    for sel in _comment_input_selectors(page):
         try:
             el = await engage.query_selector(sel)  # type: ignore
             if el:
                 box = await el.bounding_box()
                 if box and box.get("width") and box.get("height"):
+                    _COMMENT_INPUT_WINNER[page] = sel
                     return el
         except Exception:
             continue
     return None
 
 
+# First visible comment input inside the engage bar, or null
+_JS_VISIBLE_COMMENT_INPUT = """
+(sels) => {
+  const bar = document.querySelector('.interactions.engage-bar');
+  if (!bar) return null;
+  for (const sel of sels) {
+    const el = bar.querySelector(sel);
+    if (!el) continue;
+    const r = el.getBoundingClientRect();
+    if (r.width > 0 && r.height > 0) return el;
+  }
+  return null;
+}
+"""
+
+
+# Which of the given selectors an element matches (first hit), or null
+_JS_MATCHED_SELECTOR = "(el, sels) => sels.find((s) => el.matches(s)) || null"
+
+
+async def _wait_for_comment_input(page: Page, timeout_ms: float = 3000):
+    """Block in the page until a visible comment input exists; None on timeout."""
+    selectors = _comment_input_selectors(page)
+    try:
+        handle = await page.wait_for_function(
+            _JS_VISIBLE_COMMENT_INPUT, arg=list(selectors), timeout=timeout_ms
+        )
+        el = handle.as_element()
+    except Exception:
+        return None
+    # Learn the winner once per page; later waits already try it first
+    if el and page not in _COMMENT_INPUT_WINNER:
+        try:
+            sel = await el.evaluate(_JS_MATCHED_SELECTOR, list(selectors))
+            if sel:
+                _COMMENT_INPUT_WINNER[page] = sel
+        except Exception:
+            pass
+    return el
+
+
 async def _activate_comment_bar(page: Page) -> bool:
     try:
         eb = await page.query_selector('.interactions.engage-bar')
@@ -1608,13 +1799,51 @@ async def _activate_comment_bar(page: Page) -> bool:
         return False
 
 
+class PagePool:
+    """Reusable pages for one-off note visits; returned pages are parked on about:blank."""
+
+    def __init__(self, context: BrowserContext, max_idle: int = 2) -> None:
+        self._context = context
+        self._idle: "asyncio.Queue[Page]" = asyncio.Queue(maxsize=max(1, max_idle))
+
+    async def acquire(self) -> Page:
+        while True:
+            try:
+                page = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                return await self._context.new_page()
+            if not page.is_closed():
+                return page
+
+    async def release(self, page: Page) -> None:
+        if page.is_closed():
+            return
+        try:
+            await page.goto("about:blank")
+            self._idle.put_nowait(page)
+        except Exception:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            page = self._idle.get_nowait()
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
 async def try_type_comment_on_note(
     context: BrowserContext,
     note_url: str,
     text: str,
     config: BotConfig,
+    page_pool: Optional[PagePool] = None,
 ) -> Tuple[bool, str]:
-    page = await context.new_page()
+    page = await page_pool.acquire() if page_pool else await context.new_page()
     try:
         await page.goto(note_url, wait_until="domcontentloaded")
         # quick block/state check
@@ -1625,22 +1854,7 @@ async def try_type_comment_on_note(
         await asyncio.sleep(random.uniform(0.6, 1.6))
         # Detect app-only or missing engage UI early
         try:
-            flags = await page.evaluate(
-                """
-                () => {
-                  const bodyText = document.body ? document.body.innerText : '';
-                  const lower = bodyText.toLowerCase();
-                  const tokens = ['当前笔记暂时无法浏览','暂时无法浏览','打开app','去app','app内打开','下载app','open in app'];
-                  let appOnly = false;
-                  for (const t of tokens) {
-                    if (!t) continue;
-                    if (bodyText.includes(t) || lower.includes(t.toLowerCase())) { appOnly = true; break; }
-                  }
-                  const hasEngage = !!document.querySelector('.interactions.engage-bar');
-                  return { appOnly, hasEngage };
-                }
-                """
-            )
+            flags = await page.evaluate(_JS_NOTE_PAGE_FLAGS)
         except Exception:
             flags = {"appOnly": False, "hasEngage": False}
         if (flags and (flags.get("appOnly") or not flags.get("hasEngage"))):
@@ -1649,12 +1863,7 @@ async def try_type_comment_on_note(
         if not await _activate_comment_bar(page):
             return False, "no-activate"
         # Try to find comment input
-        input_el = None
-        for _ in range(6):
-            input_el = await _find_comment_input(page)
-            if input_el:
-                break
-            await asyncio.sleep(0.5)
+        input_el = await _wait_for_comment_input(page, timeout_ms=3000)
         if not input_el:
             return False, "no-input"
         try:
@@ -1671,14 +1880,14 @@ async def try_type_comment_on_note(
                 pass
         # Ensure focus and reveal of submit/cancel controls
         try:
-            await page.evaluate("el => el.focus()", input_el)
+            await page.evaluate(_JS_FOCUS_EL, input_el)
         except Exception:
             pass
         try:
             await page.wait_for_selector('.interactions.engage-bar .right-btn-area', state='visible', timeout=1500)
         except Exception:
             pass
-        ok, treason = await _type_into_comment_input(page, config, text)
+        ok, treason = await _type_into_comment_input(page, config, text, input_el)
         if not ok:
             return False, treason
         # Submit if requested
@@ -1690,8 +1899,61 @@ async def try_type_comment_on_note(
     except Exception as exc:
         return False, f"error:{exc.__class__.__name__}"
     finally:
+        if page_pool:
+            await page_pool.release(page)
+        else:
+            try:
+                await page.close()
+            except Exception:
+                pass
+
+
+async def _wait_for_note_open(page: Page, timeout_ms: int = 3000) -> bool:
+    """Wait for a clicked card to open its note, returning on the first positive signal.
+
+    The note UI (overlay or full page) is raced against a URL change to /explore/.
+    When the URL wins, the note page gets a second bounded wait for its engage bar.
+    """
+    ui = asyncio.create_task(page.wait_for_selector(_NOTE_OVERLAY_SELECTOR, timeout=timeout_ms))
+    nav = asyncio.create_task(
+        page.wait_for_url("**/explore/**", wait_until="commit", timeout=timeout_ms)
+    )
+    pending = {ui, nav}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if ui in done and ui.exception() is None:
+                return True
+            if nav in done and nav.exception() is None:
+                # Navigated to the note; let it load and render before giving up
+                try:
+                    await page.wait_for_load_state('domcontentloaded', timeout=2500)
+                except Exception:
+                    pass
+                try:
+                    await page.wait_for_selector('.interactions.engage-bar', timeout=2500)
+                    return True
+                except Exception:
+                    return False
+        return False
+    finally:
+        for task in (ui, nav):
+            if not task.done():
+                task.cancel()
+        await asyncio.gather(ui, nav, return_exceptions=True)
+
+
+async def _return_to_feed(page: Page, feed_url: str) -> None:
+    # Undo a card click that left the feed page on a note
+    if page.url == feed_url:
+        return
+    try:
+        await page.go_back(wait_until="domcontentloaded", timeout=5000)
+    except Exception:
+        pass
+    if page.url != feed_url:
         try:
-            await page.close()
+            await page.goto(feed_url, wait_until="domcontentloaded")
         except Exception:
             pass
 
@@ -1703,17 +1965,13 @@ async def try_open_and_type_comment_from_card(
     note_url: str,
     text: str,
     config: BotConfig,
+    page_pool: Optional[PagePool] = None,
 ) -> Tuple[bool, str]:
     # Try clicking the cover image anchor inside the card to open the SPA overlay.
     # Fall back to direct navigation if we cannot open from card.
     try:
         cover = None
-        for sel in [
-            'a.cover.mask.ld',
-            'a.cover.mask',
-            'a.cover',
-            'a[href^="/explore/"]',
-        ]:
+        for sel in _COVER_SELECTORS:
             try:
                 el = await note_handle.query_selector(sel)
             except Exception:
@@ -1727,36 +1985,18 @@ async def try_open_and_type_comment_from_card(
             except Exception:
                 pass
             await maybe_hover_element(page, cover, hover_probability=0.5)
-            # Simple click (SPA may open overlay). If it navigates, we handle below.
+            feed_url = page.url
+            # Simple click (SPA may open overlay or navigate to the note page).
             await cover.click()
-            # Wait briefly for overlay or navigation.
-            opened = False
-            try:
-                await page.wait_for_selector('.interactions.engage-bar, .note-container, #noteContainer', timeout=3000)
-                opened = True
-            except Exception:
-                # maybe navigated; check url change and re-detect
-                pass
+            opened = await _wait_for_note_open(page)
             if not opened:
-                try:
-                    await page.wait_for_load_state('domcontentloaded', timeout=2500)
-                except Exception:
-                    pass
-                # Re-check engage bar on current page
-                try:
-                    eb = await page.query_selector('.interactions.engage-bar')
-                    opened = bool(eb)
-                except Exception:
-                    opened = False
+                # The click may have moved the feed page without the note rendering;
+                # put the feed back before commenting from a separate page.
+                await _return_to_feed(page, feed_url)
             if opened:
                 # Now type comment within the same page (overlay)
                 # Reuse the scoped finder
-                input_el = None
-                for _ in range(8):
-                    input_el = await _find_comment_input(page)
-                    if input_el:
-                        break
-                    await asyncio.sleep(0.4)
+                input_el = await _wait_for_comment_input(page, timeout_ms=3200)
                 if not input_el:
                     # try clicking the content area to activate, then retry once more
                     try:
@@ -1772,6 +2012,7 @@ async def try_open_and_type_comment_from_card(
                         await page.keyboard.press('Escape')
                     except Exception:
                         pass
+                    await _return_to_feed(page, feed_url)
                     return False, 'no-input'
                 try:
                     await input_el.scroll_into_view_if_needed()
@@ -1786,20 +2027,21 @@ async def try_open_and_type_comment_from_card(
                     except Exception:
                         pass
                 try:
-                    await page.evaluate("el => el.focus()", input_el)
+                    await page.evaluate(_JS_FOCUS_EL, input_el)
                 except Exception:
                     pass
                 try:
                     await page.wait_for_selector('.interactions.engage-bar .right-btn-area', state='visible', timeout=1500)
                 except Exception:
                     pass
-                ok2, treason2 = await _type_into_comment_input(page, config, text)
+                ok2, treason2 = await _type_into_comment_input(page, config, text, input_el)
                 if not ok2:
                     # Close overlay if present
                     try:
                         await page.keyboard.press('Escape')
                     except Exception:
                         pass
+                    await _return_to_feed(page, feed_url)
                     return False, treason2
                 # observation pause
                 await asyncio.sleep(random.uniform(0.3, 0.8))
@@ -1816,86 +2058,145 @@ async def try_open_and_type_comment_from_card(
                         pass
                 return True, 'ok'
         # Fallback: navigate to note URL in a new page and type
-        return await try_type_comment_on_note(context, note_url, text, config)
+        return await try_type_comment_on_note(context, note_url, text, config, page_pool)
     except Exception as exc:
         return False, f'error:{exc.__class__.__name__}'
 
 
-async def _close_note_overlay(page: Page) -> bool:
-    # Try to close overlay using Escape, then close buttons, then background click.
-    def overlay_present() -> bool:
-        return False  # stub for type checker
+_CLOSE_CONTROL_SELECTORS = (
+    'button.close',
+    '[aria-label*="close" i]',
+    '.close',
+    '.icon-close',
+    'svg[class*="close" i]',
+)
+_JS_NOTE_OVERLAY_OPEN = "(sel) => !!document.querySelector(sel)"
+# Visible, in-viewport close controls of the open note overlay, in selector priority order.
+# The search is scoped to the overlay's container so a generic '.close' can't hit unrelated UI.
+_JS_OVERLAY_CLOSE_CONTROLS = """
+([overlaySel, closeSels]) => {
+  const overlay = document.querySelector(overlaySel);
+  if (!overlay) return [];
+  const root = overlay.closest('.note-detail-mask') || overlay.parentElement || overlay;
+  const vw = window.innerWidth, vh = window.innerHeight;
+  const out = [];
+  for (const sel of closeSels) {
+    let els = [];
+    try { els = root.querySelectorAll(sel); } catch (e) { continue; }
+    for (const el of els) {
+      if (out.includes(el)) continue;
+      const r = el.getBoundingClientRect();
+      if (r.width > 0 && r.height > 0 && r.left >= 0 && r.top >= 0 && r.right <= vw && r.bottom <= vh) {
+        out.push(el);
+      }
+    }
+  }
+  return out;
+}
+"""
+
+
+async def _note_overlay_open(page: Page) -> Optional[bool]:
     try:
-        present = await page.query_selector('.interactions.engage-bar, .note-container, #noteContainer')
-        if not present:
-            return True
+        return bool(await page.evaluate(_JS_NOTE_OVERLAY_OPEN, _NOTE_OVERLAY_SELECTOR))
+    except Exception:
+        return None
+
+
+async def _overlay_close_controls(page: Page) -> List[Any]:
+    try:
+        found = await page.evaluate_handle(
+            _JS_OVERLAY_CLOSE_CONTROLS, [_NOTE_OVERLAY_SELECTOR, list(_CLOSE_CONTROL_SELECTORS)]
+        )
+        props = await found.get_properties()
     except Exception:
+        return []
+    controls = []
+    for key in sorted(props, key=int):
+        el = props[key].as_element()
+        if el:
+            controls.append(el)
+    return controls
+
+
+async def _wait_overlay_detached(page: Page, timeout: float = 800) -> bool:
+    try:
+        await page.wait_for_selector(_NOTE_OVERLAY_SELECTOR, state='detached', timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+async def _close_note_overlay(page: Page) -> bool:
+    # Try to close overlay using Escape, then a close control, then background click.
+    is_open = await _note_overlay_open(page)
+    if is_open is None:
         return False
+    if not is_open:
+        return True
     # Press Escape up to 3 times, waiting briefly for the overlay to disappear
     for _ in range(3):
         try:
             await page.keyboard.press('Escape')
         except Exception:
             pass
-        try:
-            await page.wait_for_selector('.interactions.engage-bar, .note-container, #noteContainer', state='detached', timeout=800)
+        if await _wait_overlay_detached(page):
             return True
-        except Exception:
-            await asyncio.sleep(0.2)
-    # Try clicking a close control
-    for sel in [
-        'button.close',
-        '[aria-label*="close" i]',
-        '.close',
-        '.icon-close',
-        'svg[class*="close" i]'
-    ]:
+        await asyncio.sleep(0.2)
+    # Try each visible close control of the overlay; handle clicks scroll them into view
+    for control in await _overlay_close_controls(page):
         try:
-            btn = await page.query_selector(sel)
-            if btn:
-                await maybe_hover_element(page, btn, hover_probability=0.4)
-                await btn.click()
-                try:
-                    await page.wait_for_selector('.interactions.engage-bar, .note-container, #noteContainer', state='detached', timeout=800)
-                    return True
-                except Exception:
-                    pass
+            await control.click(timeout=1000)
         except Exception:
             continue
+        if await _wait_overlay_detached(page):
+            return True
+    if await _note_overlay_open(page) is False:
+        return True
     # As a last resort, click near a corner to dismiss
     try:
         vs = page.viewport_size
         if vs:
             await page.mouse.click(5, 5)
-            try:
-                await page.wait_for_selector('.interactions.engage-bar, .note-container, #noteContainer', state='detached', timeout=800)
+            if await _wait_overlay_detached(page):
                 return True
-            except Exception:
-                pass
     except Exception:
         pass
     return False
 
 
+# First enabled submit button, preferring the engage-bar one, then any button
+# labelled 发送/发表/Send/Post. Runs page-side so the whole scan is one round-trip.
+_JS_FIND_ENABLED_SUBMIT = """
+() => {
+  const sels = [
+    '.interactions.engage-bar .right-btn-area button.btn.submit:not([disabled])',
+    'button.btn.submit:not([disabled])',
+  ];
+  for (const sel of sels) {
+    const el = document.querySelector(sel);
+    if (el) return el;
+  }
+  const labels = ['发送', '发表', 'send', 'post'];
+  const buttons = Array.from(document.querySelectorAll('button:not([disabled])'));
+  for (const label of labels) {
+    const hit = buttons.find(b => (b.textContent || '').toLowerCase().includes(label));
+    if (hit) return hit;
+  }
+  return null;
+}
+"""
+
+
 async def _submit_comment(page: Page, input_el) -> None:
     # Try to find the enabled submit button near the engage bar and click it.
     # Prefer the specific submit button in the right-btn-area.
-    selectors_enabled = [
-        '.interactions.engage-bar .right-btn-area button.btn.submit:not([disabled])',
-        'button.btn.submit:not([disabled])',
-        'button:has-text("发送"):not([disabled])',
-        'button:has-text("发表"):not([disabled])',
-        'button:has-text("Send"):not([disabled])',
-        'button:has-text("Post"):not([disabled])',
-    ]
     btn = None
-    for sel in selectors_enabled:
-        try:
-            btn = await page.query_selector(sel)
-            if btn:
-                break
-        except Exception:
-            btn = None
+    try:
+        found = await page.evaluate_handle(_JS_FIND_ENABLED_SUBMIT)
+        btn = found.as_element()
+    except Exception:
+        btn = None
     # If not found enabled, wait shortly for it to become enabled after typing
     if not btn:
         try:
@@ -1930,78 +2231,132 @@ async def _submit_comment(page: Page, input_el) -> None:
             pass
 
 
-async def _type_into_comment_input(page: Page, config: BotConfig, text: str) -> Tuple[bool, str]:
-    # re-resolve input after activation in case DOM changed
-    input_el = await _find_comment_input(page)
+# Comment-box helpers installed once per document (see create_context) so the
+# typing path calls them by name instead of shipping and compiling source each time.
+_PAGE_HELPERS_INIT_SCRIPT = r"""
+(() => {
+  if (window.__xhsBot) return;
+  const commentBox = () => document.querySelector(
+    '.interactions.engage-bar #content-textarea.content-input[contenteditable="true"], ' +
+    '.interactions.engage-bar p#content-textarea[contenteditable="true"]'
+  );
+  window.__xhsBot = {
+    activeInEngageBar: () => {
+      const ae = document.activeElement;
+      return !!(ae && ae.closest && ae.closest('.interactions.engage-bar'));
+    },
+    insertText: (txt) => {
+      const el = commentBox();
+      if (!el) return false;
+      el.focus();
+      try { document.execCommand('insertText', false, txt); } catch (e) {}
+      const ev = new InputEvent('input', {bubbles: true, cancelable: true, inputType: 'insertText', data: txt});
+      el.dispatchEvent(ev);
+      return !!(el.innerText && el.innerText.length);
+    },
+    commentHasText: () => {
+      const el = commentBox();
+      if (!el) return false;
+      const t = (el.innerText || el.textContent || '').trim();
+      return t.length > 0;
+    },
+  };
+})();
+"""
+
+
+_JS_FOCUS_EL = "el => el.focus()"
+_JS_ACTIVE_IN_ENGAGE_BAR = "() => window.__xhsBot.activeInEngageBar()"
+_JS_INSERT_COMMENT_TEXT = "(txt) => window.__xhsBot.insertText(txt)"
+_JS_COMMENT_HAS_TEXT = "() => window.__xhsBot.commentHasText()"
+# App-only notes ("open in app" walls) and whether the engage bar rendered at all
+_JS_NOTE_PAGE_FLAGS = """
+() => {
+  const bodyText = document.body ? document.body.innerText : '';
+  const lower = bodyText.toLowerCase();
+  const tokens = ['当前笔记暂时无法浏览','暂时无法浏览','打开app','去app','app内打开','下载app','open in app'];
+  let appOnly = false;
+  for (const t of tokens) {
+    if (!t) continue;
+    if (bodyText.includes(t) || lower.includes(t.toLowerCase())) { appOnly = true; break; }
+  }
+  const hasEngage = !!document.querySelector('.interactions.engage-bar');
+  return { appOnly, hasEngage };
+}
+"""
+
+
+async def _eval_page_helper(page: Page, expression: str, arg: Any = None) -> Any:
+    """Evaluate an expression using window.__xhsBot, installing the helpers if the page lacks them."""
+    try:
+        return await page.evaluate(expression, arg)
+    except Exception:
+        await page.evaluate(_PAGE_HELPERS_INIT_SCRIPT)
+        return await page.evaluate(expression, arg)
+
+
+async def _type_into_comment_input(
+    page: Page, config: BotConfig, text: str, input_el=None
+) -> Tuple[bool, str]:
+    # Reuse the caller's handle; it is only re-resolved if typing hits a detached node.
+    if input_el is None:
+        input_el = await _find_comment_input(page)
     if not input_el:
         return False, 'no-input'
-    # Focus and type with per-char delay
+    # Focus, then insert or type with per-char delay
     try:
-        await page.evaluate("el => el.focus()", input_el)
+        await page.evaluate(_JS_FOCUS_EL, input_el)
     except Exception:
         pass
-    delay = random.randint(
-        max(0, config.comment_type_delay_min_ms),
-        max(config.comment_type_delay_min_ms, config.comment_type_delay_max_ms),
-    )
-    try:
-        # typing directly into the element
-        await input_el.type(text, delay=delay)
-    except Exception as e:
-        # handle potential detachment by re-querying and trying again
+    # Fast path: one insert_text call (fires a native input event) when focus is
+    # confirmed inside the engage bar, so nothing lands in the global search box.
+    inserted_fast = False
+    if config.comment_fast_insert:
         try:
-            input_el = await _find_comment_input(page)
-            if input_el:
-                await page.evaluate("el => el.focus()", input_el)
-                await input_el.type(text, delay=delay)
-            else:
-                raise e
+            if await _eval_page_helper(page, _JS_ACTIVE_IN_ENGAGE_BAR):
+                await page.keyboard.insert_text(text)
+                inserted_fast = True
         except Exception:
-            # fallback: if the active element is inside the engage bar, use page.keyboard.type
+            inserted_fast = False
+    if not inserted_fast:
+        delay = random.randint(
+            max(0, config.comment_type_delay_min_ms),
+            max(config.comment_type_delay_min_ms, config.comment_type_delay_max_ms),
+        )
+        try:
+            # typing directly into the element
+            await input_el.type(text, delay=delay)
+        except Exception as e:
+            # handle potential detachment by re-querying and trying again
             try:
-                active_ok = await page.evaluate(
-                    "() => { const ae = document.activeElement; return !!(ae && ae.closest && ae.closest('.interactions.engage-bar')); }"
-                )
+                input_el = await _find_comment_input(page)
+                if input_el:
+                    await page.evaluate(_JS_FOCUS_EL, input_el)
+                    await input_el.type(text, delay=delay)
+                else:
+                    raise e
             except Exception:
-                active_ok = False
-            if active_ok:
+                # fallback: if the active element is inside the engage bar, use page.keyboard.type
                 try:
-                    await page.keyboard.type(text, delay=delay)
-                except Exception as e2:
-                    return False, f'type-failed:{e2.__class__.__name__}'
-            else:
-                # last resort: programmatic insert to contenteditable
-                try:
-                    inserted = await page.evaluate(
-                        """
-                        (txt) => {
-                          const el = document.querySelector('.interactions.engage-bar #content-textarea.content-input[contenteditable="true"], .interactions.engage-bar p#content-textarea[contenteditable="true"]');
-                          if (!el) return false;
-                          el.focus();
-                          try { document.execCommand('insertText', false, txt); } catch (e) {}
-                          const ev = new InputEvent('input', {bubbles: true, cancelable: true, inputType: 'insertText', data: txt});
-                          el.dispatchEvent(ev);
-                          return !!(el.innerText && el.innerText.length);
-                        }
-                        """,
-                        text,
-                    )
-                    if not inserted:
-                        return False, f'type-failed:{e.__class__.__name__}'
+                    active_ok = await _eval_page_helper(page, _JS_ACTIVE_IN_ENGAGE_BAR)
                 except Exception:
-                    return False, f'type-failed:{e.__class__.__name__}'
+                    active_ok = False
+                if active_ok:
+                    try:
+                        await page.keyboard.type(text, delay=delay)
+                    except Exception as e2:
+                        return False, f'type-failed:{e2.__class__.__name__}'
+                else:
+                    # last resort: programmatic insert to contenteditable
+                    try:
+                        inserted = await _eval_page_helper(page, _JS_INSERT_COMMENT_TEXT, text)
+                        if not inserted:
+                            return False, f'type-failed:{e.__class__.__name__}'
+                    except Exception:
+                        return False, f'type-failed:{e.__class__.__name__}'
     # Verify content present
     try:
-        has_text = await page.evaluate(
-            """
-            () => {
-              const el = document.querySelector('.interactions.engage-bar #content-textarea.content-input[contenteditable="true"], .interactions.engage-bar p#content-textarea[contenteditable="true"]');
-              if (!el) return false;
-              const t = (el.innerText || el.textContent || '').trim();
-              return t.length > 0;
-            }
-            """
-        )
+        has_text = await _eval_page_helper(page, _JS_COMMENT_HAS_TEXT)
         if not has_text:
             return False, 'type-failed:empty'
     except Exception:
@@ -2124,6 +2479,8 @@ def parse_args(argv: List[str]) -> tuple[BotConfig, Any]:
     parser.add_argument("--comment-text-file", dest="comment_text_file", default="models/comments.txt", help="Path to comments file (one per line)")
     parser.add_argument("--comment-type-delay-min-ms", dest="comment_type_delay_min_ms", type=int, default=60, help="Minimum per-character typing delay (ms)")
     parser.add_argument("--comment-type-delay-max-ms", dest="comment_type_delay_max_ms", type=int, default=140, help="Maximum per-character typing delay (ms)")
+    parser.add_argument("--comment-parallelism", dest="comment_parallelism", type=int, default=1, help="Comments typed concurrently on separate pages opened by note URL, skipping the card overlay (1=inline via the card overlay); the min interval then counts from when a comment is queued")
+    parser.add_argument("--comment-human-typing", dest="comment_fast_insert", action="store_false", default=True, help="Type comments key by key with per-character delays instead of a single insert")
     parser.add_argument("--comment-submit", dest="comment_submit", action="store_true", default=False, help="Submit the comment instead of dry-run typing only")
     parser.add_argument("--verbose", action="store_true", help="Print verbose progress output")
 
@@ -2186,6 +2543,8 @@ def parse_args(argv: List[str]) -> tuple[BotConfig, Any]:
         comment_type_delay_max_ms=ns.comment_type_delay_max_ms,
         comment_texts=comment_texts,
         comment_submit=ns.comment_submit,
+        comment_parallelism=max(1, ns.comment_parallelism),
+        comment_fast_insert=ns.comment_fast_insert,
         comment_buckets=comment_buckets,
     )
     return config, ns
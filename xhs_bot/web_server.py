@@ -7,17 +7,19 @@ from collections import deque
 from dataclasses import dataclass, field
 from typing import Any, Deque, Dict, List, Optional, Tuple
 import json
+import random
 import re
 from glob import glob
+from itertools import islice
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, ConfigDict
 from pathlib import Path
 import os
 import threading
 import webbrowser
-from datetime import datetime
 
 from .cli import (
     BotConfig,
@@ -33,6 +35,14 @@ from .cli import (
 )
 from urllib.parse import quote_plus
 
+# orjson ships with the `web` extra; fall back to stdlib json for installs that predate it
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse as _JSONResponse
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    _JSONResponse = JSONResponse
+
 
 @dataclass
 class RunParams:
@@ -70,10 +80,64 @@ class RunParams:
     comment_type_delay_min_ms: int = 60
     comment_type_delay_max_ms: int = 140
     comment_submit: bool = True  # crossfit.sh sets COMMENT_SUBMIT=1
+    comment_parallelism: int = 1
+    comment_fast_insert: bool = True
     comment_text_file: str = str(Path(__file__).resolve().parent.parent / "models" / "comments.txt")
     verbose: bool = True
 
 
+class RunParamsModel(BaseModel):
+    """Request body for /start; defaults come from RunParams.
+
+    Unknown fields are rejected (422), so a field added to RunParams but not here fails loudly.
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    keyword: str = RunParams.keyword
+    limit: int = RunParams.limit
+    search_type: str = RunParams.search_type
+    duration_min: int = RunParams.duration_min
+    user_data_dir: str = RunParams.user_data_dir
+    headless: bool = RunParams.headless
+    like_prob: float = RunParams.like_prob
+    delay_ms: int = RunParams.delay_ms
+    delay_jitter_pct: int = RunParams.delay_jitter_pct
+    delay_model: str = RunParams.delay_model
+    hover_prob: float = RunParams.hover_prob
+    slow_mo_ms: int = RunParams.slow_mo_ms
+    ramp_up_s: int = RunParams.ramp_up_s
+    long_pause_prob: float = RunParams.long_pause_prob
+    long_pause_min_s: float = RunParams.long_pause_min_s
+    long_pause_max_s: float = RunParams.long_pause_max_s
+    session_cap_min: int = RunParams.session_cap_min
+    session_cap_max: int = RunParams.session_cap_max
+    human_idle_prob: float = RunParams.human_idle_prob
+    human_idle_min_s: float = RunParams.human_idle_min_s
+    human_idle_max_s: float = RunParams.human_idle_max_s
+    mouse_wiggle_prob: float = RunParams.mouse_wiggle_prob
+    random_order: bool = RunParams.random_order
+    stealth: bool = RunParams.stealth
+    randomize_user_agent: bool = RunParams.randomize_user_agent
+    user_agent: Optional[str] = RunParams.user_agent
+    accept_language: Optional[str] = RunParams.accept_language
+    timezone_id: Optional[str] = RunParams.timezone_id
+    comment_prob: float = RunParams.comment_prob
+    comment_max_per_session: int = RunParams.comment_max_per_session
+    comment_min_interval_s: float = RunParams.comment_min_interval_s
+    comment_type_delay_min_ms: int = RunParams.comment_type_delay_min_ms
+    comment_type_delay_max_ms: int = RunParams.comment_type_delay_max_ms
+    comment_submit: bool = RunParams.comment_submit
+    comment_parallelism: int = RunParams.comment_parallelism
+    comment_fast_insert: bool = RunParams.comment_fast_insert
+    comment_text_file: str = RunParams.comment_text_file
+    verbose: bool = RunParams.verbose
+
+
+class KeywordRefreshModel(BaseModel):
+    keywords: Optional[List[str]] = None
+
+
 @dataclass
 class RunStatus:
     running: bool = False
@@ -87,6 +151,12 @@ class RunStatus:
     params: Optional[RunParams] = None
     last_liked_url: Optional[str] = None
     last_liked_title: Optional[str] = None
+    _params_dict: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # params are fixed for the run; snapshot them once for /status polls
+        if self.params is not None:
+            self._params_dict = dict(self.params.__dict__)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -99,18 +169,26 @@ class RunStatus:
             "error": self.error,
             "liked": self.liked,
             "skipped": self.skipped,
-            "params": self.params.__dict__ if self.params else None,
+            "params": self._params_dict,
             "last_liked_url": self.last_liked_url,
             "last_liked_title": self.last_liked_title,
         }
 
 
+# "[ts] Liked: URL", "[ts] Skipped ..." or "Skipped (...)" lines from cli.py
+_LOG_CLASSIFY_RE = re.compile(r"^[ \t]*(?:\[[^\]\n]*\] (?:(Liked:)|Skipped)|Skipped )", re.MULTILINE)
+# URL following a matched "Liked:"
+_LIKED_URL_RE = re.compile(r"[ \t]*(\S+)")
+
+
 class _StreamWriter:
-    """A simple stdout proxy that captures lines per run while forwarding to original stdout."""
+    """A simple stdout proxy that forwards to original stdout and hands raw chunks to a callback.
 
-    def __init__(self, append_line_cb):
-        self._buf = ""
-        self._append = append_line_cb
+    Line splitting and parsing happen later, off the writer's call path.
+    """
+
+    def __init__(self, push_chunk_cb):
+        self._push = push_chunk_cb
         self._orig = sys.stdout
 
     def write(self, s: str) -> int:
@@ -119,14 +197,10 @@ class _StreamWriter:
             self._orig.write(s)
         except Exception:
             pass
-        # Buffer and split lines to capture discrete entries
-        self._buf += s
-        while "\n" in self._buf:
-            line, self._buf = self._buf.split("\n", 1)
-            try:
-                self._append(line)
-            except Exception:
-                pass
+        try:
+            self._push(s)
+        except Exception:
+            pass
         return len(s)
 
     def flush(self) -> None:
@@ -140,29 +214,107 @@ class RunManager:
     def __init__(self) -> None:
         self._task: Optional[asyncio.Task] = None
         self._cancel_event = asyncio.Event()
-        self._logs: Deque[Tuple[int, str]] = deque(maxlen=2000)
+        self._logs: Deque[str] = deque(maxlen=2000)
         self._log_index: int = 0
+        # index of self._logs[0]; indices are contiguous so polling is a slice
+        self._log_base_index: int = 1
         self._status: RunStatus = RunStatus()
         self._lock = asyncio.Lock()
+        # Raw stdout chunks for the current run; None tells the drain task to stop
+        self._log_q: Optional["asyncio.Queue[Optional[str]]"] = None
+        self._log_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Chunks that arrived while the queue was full, kept in order
+        self._log_overflow: List[Optional[str]] = []
+
+    def _push_chunk(self, chunk: Optional[str]) -> None:
+        # May be called from any thread that prints while stdout is captured.
+        loop = self._log_loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            # Already on the loop thread: no need to wake it through the self-pipe
+            self._enqueue_chunk(chunk)
+            return
+        try:
+            loop.call_soon_threadsafe(self._enqueue_chunk, chunk)
+        except RuntimeError:
+            pass
 
-    def _append_log(self, line: str) -> None:
-        self._log_index += 1
-        idx = self._log_index
-        # lightweight counters based on common prefixes in cli.py output
-        l = line.strip()
-        if l.startswith("[") and "] Liked:" in l:
-            self._status.liked += 1
-            # extract URL and optional title if present
+    def _enqueue_chunk(self, chunk: Optional[str]) -> None:
+        q = self._log_q
+        if q is None:
+            return
+        if self._log_overflow or q.full():
+            # never block the bot; spill and let the drain catch up in order
+            self._log_overflow.append(chunk)
+            return
+        q.put_nowait(chunk)
+
+    def _emit(self, line: str) -> None:
+        self._push_chunk(line + "\n")
+
+    async def _drain_logs(self, q: "asyncio.Queue[Optional[str]]") -> None:
+        buf = ""
+        pending: Deque[Optional[str]] = deque()
+        done = False
+        while not done:
+            # block for one chunk, then batch whatever else is already waiting
+            batch: List[str] = []
+            while len(batch) < 64:
+                if pending:
+                    chunk = pending.popleft()
+                elif not q.empty():
+                    chunk = q.get_nowait()
+                elif self._log_overflow:
+                    pending = deque(self._log_overflow)
+                    self._log_overflow = []
+                    continue
+                elif batch:
+                    break
+                else:
+                    chunk = await q.get()
+                if chunk is None:
+                    done = True
+                    break
+                batch.append(chunk)
+            buf += "".join(batch)
+            cut = buf.rfind("\n")
+            if cut < 0:
+                continue
+            text, buf = buf[:cut], buf[cut + 1:]
             try:
-                # formats like: [ts] Liked: URL
-                after = l.split("Liked:", 1)[1].strip()
-                url = after.split()[0]
-                self._status.last_liked_url = url
+                self._append_logs(text)
             except Exception:
                 pass
-        elif l.startswith("Skipped ") or l.startswith("[") and "] Skipped" in l:
-            self._status.skipped += 1
-        self._logs.append((idx, line))
+
+    def _append_logs(self, text: str) -> None:
+        """Record a newline-joined batch of complete lines and update counters once."""
+        lines = text.split("\n")
+        # lightweight counters based on common prefixes in cli.py output
+        liked = skipped = 0
+        last_url = None
+        for m in _LOG_CLASSIFY_RE.finditer(text):
+            if m.group(1):
+                liked += 1
+                # formats like: [ts] Liked: URL
+                um = _LIKED_URL_RE.match(text, m.end(1))
+                if um:
+                    last_url = um.group(1)
+            else:
+                skipped += 1
+        if liked:
+            self._status.liked += liked
+            if last_url:
+                self._status.last_liked_url = last_url
+        if skipped:
+            self._status.skipped += skipped
+        self._log_index += len(lines)
+        self._logs.extend(lines)
+        self._log_base_index = self._log_index - len(self._logs) + 1
 
     async def start(self, params: RunParams) -> None:
         async with self._lock:
@@ -172,6 +324,12 @@ class RunManager:
             self._status = RunStatus(running=True, stopping=False, started_at=time.time(), params=params)
             self._logs.clear()
             self._log_index = 0
+            self._log_base_index = 1
+            log_q: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=4096)
+            self._log_q = log_q
+            self._log_overflow = []
+            self._log_loop = asyncio.get_running_loop()
+            drain_task = asyncio.create_task(self._drain_logs(log_q))
 
             async def runner() -> None:
                 # Prepare config from params
@@ -224,9 +382,11 @@ class RunManager:
                 cfg.comment_texts = comment_texts
                 cfg.comment_buckets = comment_buckets
                 cfg.comment_submit = params.comment_submit
+                cfg.comment_parallelism = max(1, params.comment_parallelism)
+                cfg.comment_fast_insert = params.comment_fast_insert
                 # Capture stdout for this task
                 orig_stdout = sys.stdout
-                sys.stdout = _StreamWriter(self._append_log)  # type: ignore
+                sys.stdout = _StreamWriter(self._push_chunk)  # type: ignore
                 exit_code: Optional[int] = None
                 try:
                     exit_code = await cmd_like_latest(
@@ -237,16 +397,22 @@ class RunManager:
                         duration_min=params.duration_min,
                     )
                 except asyncio.CancelledError:
-                    self._append_log("[web] Run cancelled by user.")
+                    self._emit("[web] Run cancelled by user.")
                     raise
                 except Exception as exc:  # unexpected
                     self._status.error = f"{exc.__class__.__name__}: {exc}"
-                    self._append_log(f"[web] Error: {self._status.error}")
+                    self._emit(f"[web] Error: {self._status.error}")
                 finally:
                     try:
                         sys.stdout = orig_stdout  # type: ignore
                     except Exception:
                         pass
+                    # Let the drain task catch up with everything printed during the run.
+                    self._push_chunk(None)
+                    try:
+                        await asyncio.wait_for(drain_task, timeout=5.0)
+                    except asyncio.TimeoutError:
+                        pass  # wait_for has already cancelled the drain task
                     self._status.exit_code = exit_code
                     self._status.finished_at = time.time()
                     self._status.running = False
@@ -272,24 +438,29 @@ class RunManager:
                 self._status.finished_at = time.time()
 
     async def status(self) -> RunStatus:
-        async with self._lock:
-            return self._status
+        # Read-only; the lock only serialises start/stop
+        return self._status
 
     async def logs_since(self, from_index: int = 0) -> Tuple[int, List[str]]:
-        async with self._lock:
-            lines: List[str] = []
-            next_index = self._log_index
-            for idx, line in self._logs:
-                if idx > from_index:
-                    lines.append(line)
-            return next_index, lines
+        # No lock: appends only happen on the event loop, so this read is consistent
+        next_index = self._log_index
+        start = max(0, from_index - self._log_base_index + 1)
+        return next_index, list(islice(self._logs, start, None))
 
 
 RUNNER = RunManager()
 
 
+# (epoch second, formatted) - the string only changes once per second
+_NOW_ISO_CACHE: List[Any] = [0, ""]
+
+
 def _now_iso() -> str:
-    return datetime.now().isoformat(timespec="seconds")
+    t = int(time.time())
+    if t != _NOW_ISO_CACHE[0]:
+        _NOW_ISO_CACHE[0] = t
+        _NOW_ISO_CACHE[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(t))
+    return _NOW_ISO_CACHE[1]
 
 
 def _hashtags_to_keyword(raw: Any) -> str:
@@ -313,7 +484,56 @@ def _hashtags_to_keyword(raw: Any) -> str:
 
 
 
+_KEYWORD_RE = re.compile(r"\bKEYWORD\s*=\s*([^\n\r]+)")
+# shell substitution or other suspicious tokens: ${ } $( ) ` :- \ and line breaks
+_BAD_TOKEN_RE = re.compile(r"\$\{|\}|\$\(|\)|`|:-|\\|\n|\r")
+_PLACEHOLDER_RE = re.compile(r"^(?:keyword|\$\(keyword)", re.IGNORECASE)
+
+# Curated defaults, pinned first in this order
+_CURATED = ["crossfit", "CrossFit训练", "fitnessgirl", "功能性训练", "力量训练"]
+_CURATED_IDX = {v: i for i, v in enumerate(_CURATED)}
+
+# Last computed keyword list, keyed by the mtimes of the files it was built from
+_KW_CACHE: Dict[str, Any] = {"sig": None, "items": None}
+
+
+def _read_tail_lines(path: Path, max_lines: int) -> List[bytes]:
+    """Return up to the last max_lines complete lines of a file without reading all of it."""
+    with path.open("rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        back = min(size, 512 * 1024)
+        while True:
+            f.seek(size - back)
+            lines = f.read(back).split(b"\n")
+            if back < size:
+                # first piece is a partial line
+                lines = lines[1:]
+            if lines and not lines[-1]:
+                lines.pop()
+            if len(lines) >= max_lines or back >= size:
+                return lines[-max_lines:]
+            back = min(size, back * 2)
+
+
+def _keyword_sources_signature() -> Tuple[Any, ...]:
+    try:
+        log_sig: Any = SESSION_LOG_PATH.stat().st_mtime_ns
+    except OSError:
+        log_sig = None
+    scripts = []
+    for path in glob(str(Path(__file__).resolve().parent.parent / "*.sh")):
+        try:
+            scripts.append((path, os.stat(path).st_mtime_ns))
+        except OSError:
+            continue
+    return (log_sig, tuple(sorted(scripts)))
+
+
 def _collect_known_keywords() -> List[str]:
+    sig = _keyword_sources_signature()
+    if _KW_CACHE["items"] is not None and _KW_CACHE["sig"] == sig:
+        return list(_KW_CACHE["items"])
     def _sanitize_kw(raw: str) -> Optional[str]:
         if not raw:
             return None
@@ -322,13 +542,12 @@ def _collect_known_keywords() -> List[str]:
         if (kw.startswith('"') and kw.endswith('"')) or (kw.startswith("'") and kw.endswith("'")):
             kw = kw[1:-1].strip()
         # ignore shell substitution or suspicious tokens
-        bad_tokens = ['${', '}', '$(', ')', '`', ':-', '\\', '\n', '\r']
-        if any(t in kw for t in bad_tokens):
+        if _BAD_TOKEN_RE.search(kw):
             return None
         # collapse surrounding whitespace
         kw = kw.strip()
         # reject obviously placeholder-like values
-        if kw.lower().startswith('keyword') or kw.lower().startswith('$(keyword'):
+        if _PLACEHOLDER_RE.match(kw):
             return None
         return kw or None
     seen: Dict[str, int] = {}
@@ -336,7 +555,7 @@ def _collect_known_keywords() -> List[str]:
     # From session logs
     try:
         if SESSION_LOG_PATH.exists():
-            for raw in SESSION_LOG_PATH.read_text("utf-8", errors="ignore").splitlines()[-2000:]:
+            for raw in _read_tail_lines(SESSION_LOG_PATH, 2000):
                 try:
                     obj = json.loads(raw)
                 except Exception:
@@ -351,23 +570,28 @@ def _collect_known_keywords() -> List[str]:
         pass
     # From shell scripts in repo root
     try:
+        texts: List[str] = []
+        stems: List[str] = []
         for path in glob(str(Path(__file__).resolve().parent.parent / "*.sh")):
             try:
-                txt = Path(path).read_text("utf-8", errors="ignore")
+                texts.append(Path(path).read_text("utf-8", errors="ignore"))
             except Exception:
                 continue
-            m = re.findall(r"\bKEYWORD\s*=\s*([^\n\r]+)", txt)
-            for val in m:
-                # take first token on the line
-                first = val.strip().split()[0]
-                kw = _sanitize_kw(first) or ""
-                if not kw:
-                    continue
-                k = kw.lower()
-                seen[k] = seen.get(k, 0) + 1
-                latest_case[k] = kw
-            # Also use filename as hint
-            base = Path(path).stem
+            stems.append(Path(path).stem)
+        # one scan over all scripts; the NUL separator keeps matches inside their file
+        for val in _KEYWORD_RE.findall("\n\x00\n".join(texts)):
+            # take first token on the line
+            parts = val.split(None, 1)
+            if not parts or parts[0].startswith("\x00"):
+                continue
+            kw = _sanitize_kw(parts[0]) or ""
+            if not kw:
+                continue
+            k = kw.lower()
+            seen[k] = seen.get(k, 0) + 1
+            latest_case[k] = kw
+        # Also use filenames as hints
+        for base in stems:
             if base and base != 'run' and len(base) <= 24:
                 k = base.lower()
                 seen[k] = seen.get(k, 0) + 1
@@ -375,8 +599,7 @@ def _collect_known_keywords() -> List[str]:
     except Exception:
         pass
     # Curated defaults
-    curated = ["crossfit", "CrossFit训练", "fitnessgirl", "功能性训练", "力量训练"]
-    for kw in curated:
+    for kw in _CURATED:
         if kw.lower() not in latest_case:
             latest_case[kw.lower()] = kw
             seen[kw.lower()] = 1
@@ -384,18 +607,72 @@ def _collect_known_keywords() -> List[str]:
     # Sort curated first in order, then by frequency desc, then alpha
     def sort_key(item):
         k, v = item
-        try:
-            pin = curated.index(v)
-        except ValueError:
-            pin = len(curated)
-        return (pin, -seen.get(k, 0), v)
+        return (_CURATED_IDX.get(v, len(_CURATED)), -seen.get(k, 0), v)
 
     ordered = sorted(latest_case.items(), key=sort_key)
+    seen_exact = set()
     items = []
     for _, v in ordered:
-        if v not in items:
+        if v not in seen_exact:
+            seen_exact.add(v)
             items.append(v)
-    return items
+    _KW_CACHE["sig"] = sig
+    _KW_CACHE["items"] = items
+    return list(items)
+
+
+# Defines window.__xhsCollectLikes() on every page of the sampling context: scans the
+# first 40 search cards and returns {n, median, p75} of their like counts.
+_COLLECT_LIKES_INIT_SCRIPT = r"""
+(() => {
+  const W_RE = /^(\d+(?:\.\d+)?)\s*[wW]$/;
+  const D_RE = /\d+/;
+  const N_RE = /^\d+(?:\.\d+)?$/;
+  const parseCount = (raw) => {
+    if (!raw) return null;
+    const t = String(raw).trim();
+    if (!t) return null;
+    // plain numbers (the common case) skip the suffix/digit scans; the anchored
+    // check keeps '+t' from accepting 'Infinity', '1e3' or '0x10'
+    if (N_RE.test(t)) return Math.trunc(+t);
+    // only counts ending in w/W (x10k) need the suffix regex
+    const last = t.charCodeAt(t.length - 1);
+    if (last === 119 || last === 87) {
+      const mW = t.match(W_RE);
+      if (mW) return Math.round(parseFloat(mW[1]) * 10000);
+    }
+    const d = t.match(D_RE);
+    return d ? parseInt(d[0], 10) : null;
+  };
+  window.__xhsCollectLikes = () => {
+    const nodes = Array.from(document.querySelectorAll('section.note-item'));
+    const likes = [];
+    for (const n of nodes.slice(0, 40)) {
+      const c = n.querySelector('.like-wrapper .count');
+      let v = null;
+      if (c) v = parseCount(c.textContent || '');
+      if (v == null) v = parseCount(n.getAttribute('data-like-count'));
+      if (v == null) v = parseCount((n.getAttribute('aria-label') || ''));
+      if (v != null && !Number.isNaN(v)) likes.push(v);
+    }
+    // summarise in-page so only three numbers cross the wire
+    likes.sort((a, b) => a - b);
+    const n = likes.length;
+    if (!n) return { n: 0, median: 0, p75: 0 };
+    return { n, median: likes[n >> 1], p75: likes[Math.floor(0.75 * (n - 1))] };
+  };
+})();
+"""
+_JS_COLLECT_LIKES = "() => window.__xhsCollectLikes()"
+
+
+async def _collect_likes_summary(page: Any) -> Any:
+    """Run the like-count scan, installing it first if the init script didn't reach this page."""
+    try:
+        return await page.evaluate(_JS_COLLECT_LIKES)
+    except Exception:
+        await page.evaluate(_COLLECT_LIKES_INIT_SCRIPT)
+        return await page.evaluate(_JS_COLLECT_LIKES)
 
 
 class PopularityManager:
@@ -409,11 +686,23 @@ class PopularityManager:
         self.total: int = 0
         self.error: Optional[str] = None
         self.cache_path = Path.cwd() / ".xhs_bot" / "keyword_popularity.json"
-        self.data: Dict[str, Any] = self._load()
+        # loaded on first access so startup doesn't touch the disk
+        self._data: Optional[Dict[str, Any]] = None
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = self._load()
+        return self._data
 
     def _load(self) -> Dict[str, Any]:
         try:
             if self.cache_path.exists():
+                if orjson is not None:
+                    try:
+                        return orjson.loads(self.cache_path.read_bytes())
+                    except orjson.JSONDecodeError:
+                        pass  # e.g. invalid UTF-8: the lenient stdlib read below still recovers it
                 return json.loads(self.cache_path.read_text("utf-8", errors="ignore"))
         except Exception:
             pass
@@ -422,10 +711,25 @@ class PopularityManager:
     def _save(self) -> None:
         try:
             self.cache_path.parent.mkdir(parents=True, exist_ok=True)
-            self.cache_path.write_text(json.dumps(self.data, ensure_ascii=False, indent=2), encoding="utf-8")
+            if orjson is not None:
+                # same bytes as the stdlib branch below (2-space indent, raw UTF-8)
+                self.cache_path.write_bytes(orjson.dumps(self.data, option=orjson.OPT_INDENT_2))
+            else:
+                self.cache_path.write_text(json.dumps(self.data, ensure_ascii=False, indent=2), encoding="utf-8")
         except Exception:
             pass
 
+    def _record_pop_error(self, kw: str, error: str) -> None:
+        # A keyword that could not be sampled still counts towards progress
+        self.data.setdefault("keywords", {})[kw] = {
+            "ts": _now_iso(),
+            "sample_n": 0,
+            "median": 0,
+            "p75": 0,
+            "error": error,
+        }
+        self.progress += 1
+
     async def _sample_popularity(self, keywords: List[str], user_data_dir: str) -> None:
         self.running = True
         self.error = None
@@ -444,33 +748,54 @@ class PopularityManager:
         )
         pw, context = await create_context(cfg)  # reuse browser context
         try:
-            page = await context.new_page()
-            for kw in keywords:
+            # compiled once per page load instead of shipping the scan source per keyword
+            await context.add_init_script(_COLLECT_LIKES_INIT_SCRIPT)
+            concurrency = 4
+            try:
+                concurrency = max(1, int(os.getenv("XHS_POP_CONCURRENCY", "4")))
+            except ValueError:
+                pass
+            sem = asyncio.Semaphore(concurrency)
+
+            async def _sample_one(kw: str) -> None:
+                # Each keyword gets its own tab so page loads overlap
+                async with sem:
+                    try:
+                        page = await context.new_page()
+                    except Exception as e:
+                        self._record_pop_error(kw, e.__class__.__name__)
+                        return
+                    try:
+                        await _sample_on_page(page, kw)
+                    finally:
+                        try:
+                            await page.close()
+                        except Exception:
+                            pass
+
+            async def _sample_on_page(page: Any, kw: str) -> None:
                 try:
                     url = f"https://www.xiaohongshu.com/search_result/?keyword={quote_plus(kw)}&type=51"
-                    await page.goto(url, wait_until="domcontentloaded")
-                    # Give the page time to render cards
-                    await asyncio.sleep(1.5)
+                    # return on the first response bytes; the card selector below is the real readiness signal
+                    await page.goto(url, wait_until="commit")
+                    try:
+                        await page.wait_for_selector('section.note-item', timeout=4000, state='attached')
+                        cards_ready = True
+                    except Exception:
+                        cards_ready = False
                     # Quick block/state check
                     try:
                         state = await _detect_block_state(page)  # type: ignore
                     except Exception:
                         state = None
                     if state in {"login-required", "rate-limit"}:
-                        self.data.setdefault("keywords", {})[kw] = {
-                            "ts": _now_iso(),
-                            "sample_n": 0,
-                            "median": 0,
-                            "p75": 0,
-                            "error": str(state),
-                        }
-                        self.progress += 1
+                        self._record_pop_error(kw, str(state))
                         await asyncio.sleep(0.5)
-                        continue
-                    # Try ensure filter panel isn't blocking and cards are visible
-                    try:
-                        await page.wait_for_selector('section.note-item', timeout=4000)
-                    except Exception:
+                        return
+                    if cards_ready:
+                        # brief settle so counts on the first cards have rendered
+                        await asyncio.sleep(random.uniform(0.2, 0.4))
+                    else:
                         # light scroll to trigger lazy load
                         try:
                             for _ in range(3):
@@ -483,60 +808,21 @@ class PopularityManager:
                         await apply_latest_filter(page, cfg)  # type: ignore
                     except Exception:
                         pass
-                    # collect like counts from visible cards
-                    counts = await page.evaluate(
-                        r"""
-                        () => {
-                          const nodes = Array.from(document.querySelectorAll('section.note-item'));
-                          const parseCount = (raw) => {
-                            if (!raw) return null;
-                            const t = String(raw).trim();
-                            const mW = t.match(/^(\d+(?:\.\d+)?)\s*[wW]$/);
-                            if (mW) return Math.round(parseFloat(mW[1]) * 10000);
-                            const d = t.match(/\d+/g);
-                            if (d && d.length) return parseInt(d[0], 10);
-                            return null;
-                          };
-                          const likes = [];
-                          for (const n of nodes.slice(0, 40)) {
-                            const c = n.querySelector('.like-wrapper .count');
-                            let v = null;
-                            if (c) v = parseCount(c.textContent || '');
-                            if (v == null) v = parseCount(n.getAttribute('data-like-count'));
-                            if (v == null) v = parseCount((n.getAttribute('aria-label') || ''));
-                            if (v != null && !Number.isNaN(v)) likes.push(v);
-                          }
-                          return likes;
-                        }
-                        """
-                    )
-                    likes = [int(x) for x in (counts or []) if isinstance(x, (int, float))]
-                    likes = likes[:40]
-                    score = None
-                    med = None
-                    if likes:
-                        s = sorted(likes)
-                        n = len(s)
-                        med = int(s[n//2])
-                        p75 = int(s[int(0.75 * (n-1))]) if n > 1 else int(s[0])
-                        score = p75
+                    # collect like counts from visible cards, summarised in-page
+                    summary = await _collect_likes_summary(page)
+                    if not isinstance(summary, dict):
+                        summary = {}
                     self.data.setdefault("keywords", {})[kw] = {
                         "ts": _now_iso(),
-                        "sample_n": len(likes),
-                        "median": med if med is not None else 0,
-                        "p75": score if score is not None else 0,
+                        "sample_n": int(summary.get("n") or 0),
+                        "median": int(summary.get("median") or 0),
+                        "p75": int(summary.get("p75") or 0),
                     }
                     self.progress += 1
                     await asyncio.sleep(0.8)
                 except Exception as e:
-                    self.data.setdefault("keywords", {})[kw] = {
-                        "ts": _now_iso(),
-                        "sample_n": 0,
-                        "median": 0,
-                        "p75": 0,
-                        "error": f"{e.__class__.__name__}"
-                    }
-                    self.progress += 1
+                    self._record_pop_error(kw, e.__class__.__name__)
+            await asyncio.gather(*(_sample_one(kw) for kw in keywords))
             self.data["updated_ts"] = _now_iso()
             self._save()
         finally:
@@ -559,15 +845,15 @@ class PopularityManager:
             self._task = asyncio.create_task(self._sample_popularity(keywords, user_data_dir))
 
     async def status(self) -> Dict[str, Any]:
-        async with self._lock:
-            return {
-                "running": self.running,
-                "started_at": self.started_at,
-                "finished_at": self.finished_at,
-                "progress": self.progress,
-                "total": self.total,
-                "updated_ts": self.data.get("updated_ts"),
-            }
+        # Read-only; the lock only guards starting a refresh
+        return {
+            "running": self.running,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "progress": self.progress,
+            "total": self.total,
+            "updated_ts": self.data.get("updated_ts"),
+        }
 
 
 POPULARITY = PopularityManager()
@@ -580,62 +866,31 @@ _STATIC_DIR = Path(__file__).with_name("web_static")
 app.mount("/static", StaticFiles(directory=str(_STATIC_DIR)), name="static")
 
 
+# The UI is a single static page; read it once instead of on every GET /
+try:
+    _INDEX_HTML_BYTES = _STATIC_DIR.joinpath("index.html").read_bytes()
+except OSError:
+    _INDEX_HTML_BYTES = b""
+
+
 @app.get("/", response_class=HTMLResponse)
 async def index() -> HTMLResponse:
     # Serve the simple HTML UI
-    return HTMLResponse(_STATIC_DIR.joinpath("index.html").read_text("utf-8"))
+    return HTMLResponse(content=_INDEX_HTML_BYTES)
 
 
 @app.post("/start")
-async def start_run(payload: Dict[str, Any]) -> JSONResponse:
-    try:
-        params = RunParams(
-            keyword=str(payload.get("keyword", RunParams.keyword)).strip() or RunParams.keyword,
-            limit=int(payload.get("limit", RunParams.limit)),
-            search_type=str(payload.get("search_type", RunParams.search_type)),
-            duration_min=int(payload.get("duration_min", RunParams.duration_min)),
-            user_data_dir=str(payload.get("user_data_dir", RunParams.user_data_dir)),
-            headless=bool(payload.get("headless", RunParams.headless)),
-            like_prob=float(payload.get("like_prob", RunParams.like_prob)),
-            delay_ms=int(payload.get("delay_ms", RunParams.delay_ms)),
-            delay_jitter_pct=int(payload.get("delay_jitter_pct", RunParams.delay_jitter_pct)),
-            delay_model=str(payload.get("delay_model", RunParams.delay_model)),
-            hover_prob=float(payload.get("hover_prob", RunParams.hover_prob)),
-            slow_mo_ms=int(payload.get("slow_mo_ms", RunParams.slow_mo_ms)),
-            ramp_up_s=int(payload.get("ramp_up_s", RunParams.ramp_up_s)),
-            long_pause_prob=float(payload.get("long_pause_prob", RunParams.long_pause_prob)),
-            long_pause_min_s=float(payload.get("long_pause_min_s", RunParams.long_pause_min_s)),
-            long_pause_max_s=float(payload.get("long_pause_max_s", RunParams.long_pause_max_s)),
-            session_cap_min=int(payload.get("session_cap_min", RunParams.session_cap_min)),
-            session_cap_max=int(payload.get("session_cap_max", RunParams.session_cap_max)),
-            human_idle_prob=float(payload.get("human_idle_prob", RunParams.human_idle_prob)),
-            human_idle_min_s=float(payload.get("human_idle_min_s", RunParams.human_idle_min_s)),
-            human_idle_max_s=float(payload.get("human_idle_max_s", RunParams.human_idle_max_s)),
-            mouse_wiggle_prob=float(payload.get("mouse_wiggle_prob", RunParams.mouse_wiggle_prob)),
-            random_order=bool(payload.get("random_order", RunParams.random_order)),
-            stealth=bool(payload.get("stealth", RunParams.stealth)),
-            randomize_user_agent=bool(payload.get("randomize_user_agent", RunParams.randomize_user_agent)),
-            user_agent=(str(payload.get("user_agent")) if payload.get("user_agent") is not None else None),
-            accept_language=(str(payload.get("accept_language")) if payload.get("accept_language") is not None else None),
-            timezone_id=(str(payload.get("timezone_id")) if payload.get("timezone_id") is not None else None),
-            comment_prob=float(payload.get("comment_prob", RunParams.comment_prob)),
-            comment_max_per_session=int(payload.get("comment_max_per_session", RunParams.comment_max_per_session)),
-            comment_min_interval_s=float(payload.get("comment_min_interval_s", RunParams.comment_min_interval_s)),
-            comment_type_delay_min_ms=int(payload.get("comment_type_delay_min_ms", RunParams.comment_type_delay_min_ms)),
-            comment_type_delay_max_ms=int(payload.get("comment_type_delay_max_ms", RunParams.comment_type_delay_max_ms)),
-            comment_submit=bool(payload.get("comment_submit", RunParams.comment_submit)),
-            comment_text_file=str(payload.get("comment_text_file", RunParams.comment_text_file)),
-            verbose=bool(payload.get("verbose", RunParams.verbose)),
-        )
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Invalid params: {exc}")
+async def start_run(payload: RunParamsModel) -> JSONResponse:
+    data = payload.model_dump()
+    params = RunParams(**data)
+    params.keyword = params.keyword.strip() or RunParams.keyword
     if not params.keyword:
         raise HTTPException(status_code=400, detail="keyword is required")
     try:
         await RUNNER.start(params)
     except RuntimeError as exc:
         raise HTTPException(status_code=409, detail=str(exc))
-    return JSONResponse({"ok": True})
+    return _JSONResponse({"ok": True})
 
 
 @app.post("/start/hashtags")
@@ -649,25 +904,25 @@ async def start_run_from_hashtags(payload: Dict[str, Any]) -> JSONResponse:
         await RUNNER.start(params)
     except RuntimeError as exc:
         raise HTTPException(status_code=409, detail=str(exc))
-    return JSONResponse({"ok": True, "keyword": keyword})
+    return _JSONResponse({"ok": True, "keyword": keyword})
 
 
 @app.post("/stop")
 async def stop_run() -> JSONResponse:
     await RUNNER.stop()
-    return JSONResponse({"ok": True})
+    return _JSONResponse({"ok": True})
 
 
 @app.get("/status")
 async def get_status() -> JSONResponse:
     st = await RUNNER.status()
-    return JSONResponse(st.to_dict())
+    return _JSONResponse(st.to_dict())
 
 
 @app.get("/logs")
 async def get_logs(from_index: int = 0) -> JSONResponse:
     next_idx, lines = await RUNNER.logs_since(from_index)
-    return JSONResponse({"next": next_idx, "lines": lines})
+    return _JSONResponse({"next": next_idx, "lines": lines})
 
 
 @app.post("/notify/test")
@@ -676,7 +931,11 @@ async def test_notification() -> JSONResponse:
     ok, reason = await send_notification(text)
     if not ok:
         raise HTTPException(status_code=502, detail=f"Notification test failed: {reason}")
-    return JSONResponse({"ok": True, "detail": "Test notification sent."})
+    return _JSONResponse({"ok": True, "detail": "Test notification sent."})
+
+
+# Last couple of popularity orderings served by /keywords
+_POP_SORT_CACHE: Dict[Tuple[Any, ...], List[str]] = {}
 
 
 @app.get("/keywords")
@@ -684,11 +943,24 @@ async def get_keywords(sort: Optional[str] = None) -> JSONResponse:
     items = _collect_known_keywords()
     scores = POPULARITY.data.get("keywords", {}) if isinstance(POPULARITY.data, dict) else {}
     if sort == "pop":
-        def pop_score(kw: str) -> int:
-            rec = scores.get(kw, {}) if isinstance(scores, dict) else {}
-            return int(rec.get("p75", 0) or 0)
-        items = sorted(items, key=lambda kw: (-pop_score(kw), kw.lower()))
-    return JSONResponse({
+        # scores only change as a refresh makes progress, so polls mostly reuse the last order
+        cache_key = (
+            POPULARITY.data.get("updated_ts"),
+            POPULARITY.started_at,
+            POPULARITY.progress,
+            tuple(items),
+        )
+        cached = _POP_SORT_CACHE.get(cache_key)
+        if cached is None:
+            def pop_score(kw: str) -> int:
+                rec = scores.get(kw, {}) if isinstance(scores, dict) else {}
+                return int(rec.get("p75", 0) or 0)
+            cached = sorted(items, key=lambda kw: (-pop_score(kw), kw.lower()))
+            if len(_POP_SORT_CACHE) >= 2:
+                _POP_SORT_CACHE.pop(next(iter(_POP_SORT_CACHE)))
+            _POP_SORT_CACHE[cache_key] = cached
+        items = list(cached)
+    return _JSONResponse({
         "keywords": items,
         "scores": scores,
         "updated_ts": POPULARITY.data.get("updated_ts"),
@@ -696,26 +968,22 @@ async def get_keywords(sort: Optional[str] = None) -> JSONResponse:
 
 
 @app.post("/keywords/refresh")
-async def refresh_keywords(payload: Optional[Dict[str, Any]] = None) -> JSONResponse:
-    payload = payload or {}
-    kws = payload.get("keywords")
-    if kws and isinstance(kws, list):
-        keywords = [str(x) for x in kws if str(x).strip()]
-    else:
-        keywords = None
+async def refresh_keywords(payload: Optional[KeywordRefreshModel] = None) -> JSONResponse:
+    kws = payload.keywords if payload else None
+    keywords = [x for x in kws if x.strip()] if kws else None
     try:
         # use default LoginInfo as profile for access
         user_data_dir = str(Path(__file__).resolve().parent.parent / "LoginInfo")
         await POPULARITY.start(keywords, user_data_dir)
     except RuntimeError as exc:
         raise HTTPException(status_code=409, detail=str(exc))
-    return JSONResponse({"started": True})
+    return _JSONResponse({"started": True})
 
 
 @app.get("/keywords/refresh/status")
 async def refresh_status() -> JSONResponse:
     st = await POPULARITY.status()
-    return JSONResponse(st)
+    return _JSONResponse(st)
 
 
 def main() -> None: